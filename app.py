@@ -36,9 +36,22 @@ from app.tasks import (
 
 log = logging.getLogger("app")
 
+# Shared HTTP pool: keep-alive connections are reused across Jupiter quotes instead of
+# paying TCP+TLS setup per request; per-host cap stays above the poller's batch concurrency.
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 64
+HTTP_KEEPALIVE_SEC = 30.0
+HTTP_DNS_TTL_SEC = 300
+
 
 async def main(cfg_path: str) -> None:
-    async with aiohttp.ClientSession() as session:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SEC,
+        ttl_dns_cache=HTTP_DNS_TTL_SEC,
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
         ctx = await build_context(cfg_path, session)
         cfg = ctx.cfg
         settings = ctx.settings
@@ -89,8 +102,6 @@ async def main(cfg_path: str) -> None:
                 }
 
         api_server_mod = __import__("api.server", fromlist=["run_server"])
-        full_tokens = dict(cfg.trading.tokens)
-
         tasks: list[asyncio.Task] = [
             asyncio.create_task(
                 api_server_mod.run_server(
@@ -143,7 +154,6 @@ async def main(cfg_path: str) -> None:
                 verify_loop(
                     q_manager=ctx.q_manager,
                     jup=ctx.jup,
-                    full_tokens=full_tokens,
                     stable_mint=cfg.trading.stable.mint,
                     stable_decimals=cfg.trading.stable.decimals,
                     notional_usd=Decimal(str(settings.notional_usd)),
@@ -7,11 +7,11 @@ import logging
 import os
 from decimal import Decimal
 from pathlib import Path
-from typing import Any
 
 import aiohttp
 
 from connectors.jupiter import JupiterClient
+from core.arb.types import TokenCfgs
 from core.arb_engine import ArbEngine
 from core.auto_tune.metrics import MetricsCollector
 from core.bootstrap import get_paths, load_config, require_env
@@ -65,7 +65,7 @@ async def build_context(cfg_path: str, session: aiohttp.ClientSession) -> AppCon
     full_tokens = dict(cfg.trading.tokens)
     base_denylist = list(cfg.filters.denylist_symbols or [])
 
-    token_cfgs: dict[str, dict[str, Any]] = {}
+    token_cfgs = TokenCfgs()
     for token_key, t in cfg.trading.tokens.items():
         token_cfgs[token_key] = {"bybit_symbol": t.bybit_symbol, "mint": t.mint, "decimals": t.decimals}
 
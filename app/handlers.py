@@ -6,7 +6,7 @@ import asyncio
 import logging
 from typing import TYPE_CHECKING
 
-from core.runtime_settings import save_runtime_settings
+from core.runtime_settings import save_runtime_settings_async
 
 from utils.log import log_task_exception
 
@@ -75,7 +75,7 @@ def make_on_ob(ctx: AppContext):
             if not symbol:
                 continue
 
-            if await ctx.q_manager.contains(symbol):
+            if ctx.q_manager.contains(symbol):
                 continue
 
             bids = it.get("b") or it.get("bids") or []
@@ -86,7 +86,7 @@ def make_on_ob(ctx: AppContext):
                 bids = inner.get("b") or inner.get("bids") or []
                 asks = inner.get("a") or inner.get("asks") or []
 
-            ob = await ctx.state.upsert_orderbook(symbol)
+            ob = ctx.state.upsert_orderbook(symbol)
             if typ == "snapshot":
                 ob.apply_snapshot(bids, asks, now_ms, now_ms)
             elif typ == "delta":
@@ -101,7 +101,7 @@ def make_on_ob(ctx: AppContext):
 def make_on_exchange_toggle(ctx: AppContext):
     async def on_exchange_toggle(enabled: bool) -> None:
         ctx.settings.exchange_enabled = enabled
-        save_runtime_settings(str(ctx.settings_path), ctx.settings)
+        await save_runtime_settings_async(str(ctx.settings_path), ctx.settings)
         if enabled:
             ctx.exchange_enabled_event.set()
             await ctx.ws_cluster.start(ctx.cfg.bybit.symbols)
@@ -160,7 +160,7 @@ def make_on_settings_update(ctx: AppContext):
             if ctx.settings.update(k, v):
                 updated[k] = getattr(ctx.settings, k)
         if updated:
-            save_runtime_settings(str(ctx.settings_path), ctx.settings)
+            await save_runtime_settings_async(str(ctx.settings_path), ctx.settings)
             apply_settings_reload(ctx.settings)
         s = ctx.settings.to_dict()
         for k in ("auto_tune_enabled", "auto_tune_bounds"):
@@ -201,7 +201,7 @@ def make_on_auto_tune_update(ctx: AppContext):
                 if ctx.settings.update(k, v):
                     updated[k] = v
             if updated:
-                save_runtime_settings(str(ctx.settings_path), ctx.settings)
+                await save_runtime_settings_async(str(ctx.settings_path), ctx.settings)
                 apply_settings_reload(ctx.settings)
                 entry = {
                     "ts": time.time(),
@@ -218,11 +218,11 @@ def make_on_auto_tune_update(ctx: AppContext):
             if ctx.settings.auto_tune_enabled != v:
                 ctx.settings.auto_tune_enabled = v
                 updated["enabled"] = v
-                save_runtime_settings(str(ctx.settings_path), ctx.settings)
+                await save_runtime_settings_async(str(ctx.settings_path), ctx.settings)
         if "bounds" in updates and isinstance(updates["bounds"], dict):
             ctx.settings.auto_tune_bounds = updates["bounds"]
             updated["bounds"] = ctx.settings.auto_tune_bounds
-            save_runtime_settings(str(ctx.settings_path), ctx.settings)
+            await save_runtime_settings_async(str(ctx.settings_path), ctx.settings)
         return {"ok": True, "updated": updated, "auto_tune": get_auto_tune()}
 
     return on_auto_tune_update
@@ -8,7 +8,7 @@ import time
 from typing import TYPE_CHECKING
 
 from core.auto_tune.tuner import AutoTuner, TunerBounds, TunerConfig
-from core.runtime_settings import save_runtime_settings
+from core.runtime_settings import save_runtime_settings_async
 
 from app.handlers import AUTO_TUNE_HISTORY_MAX, make_apply_settings_reload
 
@@ -33,13 +33,14 @@ def make_status_loop(ctx: AppContext):
             sample_syms = symbols[:5]
             sample_parts: list[str] = []
 
+            now_ms = ctx.state.now_ms()
             for i in range(0, total, status_sample_step):
                 sym = symbols[i]
-                ob = await ctx.state.get_orderbook(sym)
+                ob = ctx.state.get_orderbook(sym)
                 sampled_n += 1
                 if ob is not None and ob.bids and ob.asks:
                     non_empty_cnt += 1
-                    if ob.age_ms() <= FRESH_MS:
+                    if ob.age_ms(now_ms) <= FRESH_MS:
                         fresh_cnt += 1
 
             if sampled_n > 0 and status_sample_step > 1:
@@ -48,13 +49,13 @@ def make_status_loop(ctx: AppContext):
                 fresh_cnt = min(total, int(fresh_cnt * scale))
 
             for sym in sample_syms:
-                ob = await ctx.state.get_orderbook(sym)
+                ob = ctx.state.get_orderbook(sym)
                 if ob is None or not ob.bids or not ob.asks:
                     sample_parts.append(f"{sym} OB empty")
                 else:
-                    best_bid = max(ob.bids.keys())
-                    best_ask = min(ob.asks.keys())
-                    sample_parts.append(f"{sym} bid={best_bid} ask={best_ask} age={ob.age_ms()}ms")
+                    best_bid = ob.best_bid()
+                    best_ask = ob.best_ask()
+                    sample_parts.append(f"{sym} bid={best_bid} ask={best_ask} age={ob.age_ms(now_ms)}ms")
 
             stats = ctx.engine.drain_debug_stats()
             if stats is not None:
@@ -120,7 +121,7 @@ def make_auto_tune_loop(ctx: AppContext):
                 for c in changes:
                     if ctx.settings.update(c.param, c.new_value):
                         apply_settings_reload(ctx.settings)
-                        save_runtime_settings(str(ctx.settings_path), ctx.settings)
+                        await save_runtime_settings_async(str(ctx.settings_path), ctx.settings)
                         entry = {
                             "ts": time.time(),
                             "source": "auto",
@@ -182,7 +183,7 @@ def make_ws_health_loop(ctx: AppContext):
             symbols = list(ctx.cfg.bybit.symbols)
             stale_syms: list[str] = []
             for sym in symbols:
-                ob = await ctx.state.get_orderbook(sym)
+                ob = ctx.state.get_orderbook(sym)
                 last_msg_ms = 0
                 if ob is not None:
                     last_msg_ms = int(ob.last_cts_ms or ob.last_update_ms or ob.last_snapshot_ms or 0)
@@ -9,6 +9,7 @@ import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from decimal import Decimal
+from operator import itemgetter
 from typing import Any
 
 import aiohttp
@@ -95,7 +96,7 @@ class LogThrottle:
         if len(self._last) <= max_items:
             return
         # drop oldest ~20%
-        items = sorted(self._last.items(), key=lambda kv: kv[1])
+        items = sorted(self._last.items(), key=itemgetter(1))
         drop = max(1, int(len(items) * 0.2))
         for k, _ in items[:drop]:
             self._last.pop(k, None)
@@ -154,13 +155,13 @@ class NegativeCache:
 
         # bound sizes (best-effort)
         if len(self._token_until) > max_token_items:
-            items = sorted(self._token_until.items(), key=lambda kv: kv[1])
+            items = sorted(self._token_until.items(), key=itemgetter(1))
             drop = max(1, int(len(items) * 0.2))
             for k, _ in items[:drop]:
                 self._token_until.pop(k, None)
 
         if len(self._pair_until) > max_pair_items:
-            items = sorted(self._pair_until.items(), key=lambda kv: kv[1])
+            items = sorted(self._pair_until.items(), key=itemgetter(1))
             drop = max(1, int(len(items) * 0.2))
             for k, _ in items[:drop]:
                 self._pair_until.pop(k, None)
@@ -236,6 +237,9 @@ class JupiterClient:
         self._on_skip = on_skip
         self._on_request = on_request
 
+        # Requests that hit 429/5xx/network errors (backpressure signal; expected 400s are not counted)
+        self.retryable_failures = 0
+
     # -------- internal utils --------
 
     def _retry_delay(self, attempt: int, retry_after: str | None = None) -> float:
@@ -311,6 +315,7 @@ class JupiterClient:
         }
         headers = {"x-api-key": self._api_key} if self._api_key else {}
 
+        throttled = False
         for attempt in range(self._max_retries):
             try:
                 async with self._rate_limiter:
@@ -323,7 +328,8 @@ class JupiterClient:
                                 pass
                         retry_after = r.headers.get("Retry-After")
                         if status == 200:
-                            j = await r.json(content_type=None)
+                            # Raw bytes straight into json.loads: no charset sniffing or str decode
+                            j = json.loads(await r.read())
                             return JupQuote(
                                 input_mint=str(j.get("inputMint", input_mint)),
                                 output_mint=str(j.get("outputMint", output_mint)),
@@ -338,6 +344,9 @@ class JupiterClient:
 
                 # Retryable: 429 / 5xx
                 if status == 429 or status >= 500:
+                    if not throttled:
+                        throttled = True
+                        self.retryable_failures += 1
                     wait_s = self._retry_delay(attempt, retry_after)
                     if self._throttle.allow(f"retry:{status}", self._retry_log_interval):
                         log.warning(
@@ -402,6 +411,9 @@ class JupiterClient:
                 return None
 
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not throttled:
+                    throttled = True
+                    self.retryable_failures += 1
                 if attempt < self._max_retries - 1:
                     wait_s = self._retry_delay(attempt)
                     if self._throttle.allow(f"net:{type(e).__name__}", self._retry_log_interval):
@@ -415,3 +427,134 @@ class JupiterClient:
                 return None
 
         return None
+
+    async def quote_exact_in_batch(
+        self,
+        reqs: list[tuple[str, str, int]],
+        concurrency: int = 8,
+        on_result: Callable[[int, JupQuote | None], None] | None = None,
+    ) -> list[JupQuote | None]:
+        """
+        Quote many (input_mint, output_mint, amount_raw) triples in one call.
+
+        Jupiter has no multi-quote endpoint, so requests are pipelined over the shared
+        session by at most `concurrency` workers (still bounded by the rate limiter).
+        Results keep the order of `reqs`; failures map to None like quote_exact_in().
+        `on_result(i, quote)` is called as each request completes, so callers can publish
+        (and timestamp) quotes without waiting for the slowest one in the batch.
+        """
+        out: list[JupQuote | None] = [None] * len(reqs)
+        if not reqs:
+            return out
+        it = iter(range(len(reqs)))
+
+        async def worker() -> None:
+            for i in it:
+                input_mint, output_mint, amount_raw = reqs[i]
+                try:
+                    out[i] = await self.quote_exact_in(input_mint, output_mint, amount_raw)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    log.exception("quote batch error %s->%s: %s", input_mint, output_mint, e)
+                if on_result is not None:
+                    on_result(i, out[i])
+
+        n = max(1, min(int(concurrency), len(reqs)))
+        await asyncio.gather(*(worker() for _ in range(n)))
+        return out
+
+
+class JupiterBatcher:
+    """
+    Coalesce concurrent single-quote requests into quote_exact_in_batch() calls.
+
+    request() enqueues and awaits a future; one dispatcher task collects requests for
+    up to window_ms (or max_batch items) and resolves each future from the batch.
+    Batches run as their own tasks, so collection continues while one is in flight.
+    """
+
+    def __init__(
+        self,
+        jup: JupiterClient,
+        window_ms: float = 10.0,
+        max_batch: int = 32,
+        concurrency: int = 8,
+    ) -> None:
+        self._jup = jup
+        self._window = max(0.0, float(window_ms)) / 1000.0
+        self._max_batch = max(1, int(max_batch))
+        self._concurrency = max(1, int(concurrency))
+        self._queue: asyncio.Queue[tuple[tuple[str, str, int], asyncio.Future[JupQuote | None]]] = asyncio.Queue()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._inflight: set[asyncio.Task[None]] = set()
+
+    async def request(self, input_mint: str, output_mint: str, amount_raw: int) -> JupQuote | None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch(), name="jup_batcher")
+        fut: asyncio.Future[JupQuote | None] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(((input_mint, output_mint, int(amount_raw)), fut))
+        return await fut
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            queue = self._queue
+            batch = [await queue.get()]
+            deadline = loop.time() + self._window
+            try:
+                while len(batch) < self._max_batch:
+                    # Already-queued requests are taken without wait_for, which wraps get() in a task
+                    try:
+                        batch.append(queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # aclose() during collection: the partial batch would otherwise hang its requesters
+                for _, fut in batch:
+                    fut.cancel()
+                raise
+            t = asyncio.create_task(self._run_batch(batch))
+            self._inflight.add(t)
+            t.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: list[tuple[tuple[str, str, int], asyncio.Future[JupQuote | None]]]) -> None:
+        def on_result(i: int, q: JupQuote | None) -> None:
+            # Resolve each request as it completes: no caller waits for the slowest in the batch
+            fut = batch[i][1]
+            if not fut.done():
+                fut.set_result(q)
+
+        try:
+            quotes = await self._jup.quote_exact_in_batch(
+                [req for req, _ in batch], concurrency=self._concurrency, on_result=on_result
+            )
+            for i, q in enumerate(quotes):
+                on_result(i, q)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        finally:
+            # Cancelled (aclose) mid-batch: never leave a requester awaiting forever
+            for _, fut in batch:
+                fut.cancel()
+
+    async def aclose(self) -> None:
+        tasks = [t for t in (self._dispatcher, *self._inflight) if t is not None]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+        # Requests still queued will never be dispatched now
+        while not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            fut.cancel()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections import OrderedDict
 from decimal import Decimal
 
 DEDUP_PRUNE_INTERVAL_SEC = 60.0
@@ -9,16 +10,20 @@ DEDUP_PRUNE_INTERVAL_SEC = 60.0
 class Dedup:
     """
     Prevent spamming the same signal too often unless profit improved enough.
+
+    Entries expire after 2x cooldown (pruned once a minute) and are kept in send
+    order, so the least recently sent key is evicted once max_entries is exceeded.
     """
 
-    def __init__(self, cooldown_sec: int, min_delta_profit: Decimal) -> None:
+    def __init__(self, cooldown_sec: int, min_delta_profit: Decimal, max_entries: int = 10_000) -> None:
         self.cooldown_sec = int(cooldown_sec)
         self.min_delta_profit = Decimal(min_delta_profit)
-        self._last_sent: dict[str, tuple[float, Decimal]] = {}
+        self.max_entries = max(1, int(max_entries))
+        self._last_sent: OrderedDict[str, tuple[float, Decimal]] = OrderedDict()
         self._last_prune_ts: float = 0.0
 
     def _prune_stale(self) -> None:
-        now = time.time()
+        now = time.monotonic()
         if (now - self._last_prune_ts) < DEDUP_PRUNE_INTERVAL_SEC:
             return
         self._last_prune_ts = now
@@ -29,7 +34,7 @@ class Dedup:
 
     def can_send(self, key: str, profit: Decimal) -> bool:
         self._prune_stale()
-        now = time.time()
+        now = time.monotonic()
         prev = self._last_sent.get(key)
         if not prev:
             return True
@@ -39,4 +44,8 @@ class Dedup:
         return True
 
     def mark_sent(self, key: str, profit: Decimal) -> None:
-        self._last_sent[key] = (time.time(), profit)
+        last_sent = self._last_sent
+        last_sent[key] = (time.monotonic(), profit)
+        last_sent.move_to_end(key)
+        while len(last_sent) > self.max_entries:
+            last_sent.popitem(last=False)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 DEFAULT_DENYLIST_SYMBOLS = {
     "XAUT",
@@ -29,8 +29,25 @@ def _normalize_bybit_base(bybit_symbol: str) -> str:
 
 @dataclass(frozen=True)
 class Denylist:
+    """
+    Symbol/regex denylist, fixed once built. is_denied() results are memoized per (token_key, bybit_symbol).
+    """
+
     symbols: set[str]
     regex: list[re.Pattern[str]]
+    _memo: dict[tuple[str, str], bool] = field(default_factory=dict, repr=False, compare=False)
+    # All patterns folded into one alternation: one search per candidate instead of one per pattern
+    _patterns: list[re.Pattern[str]] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.regex:
+            return
+        try:
+            patterns = [re.compile("|".join(f"(?:{rx.pattern})" for rx in self.regex), re.IGNORECASE)]
+        except re.error:
+            # e.g. a pattern with global inline flags can't be embedded; keep them separate
+            patterns = list(self.regex)
+        object.__setattr__(self, "_patterns", patterns)
 
     @classmethod
     def build(cls, symbols: Iterable[str] | None = None, regex: Iterable[str] | None = None) -> Denylist:
@@ -50,15 +67,21 @@ class Denylist:
         return cls(symbols=deny_syms, regex=pats)
 
     def is_denied(self, token_key: str, bybit_symbol: str) -> bool:
+        key = (token_key, bybit_symbol)
+        hit = self._memo.get(key)
+        if hit is None:
+            hit = self._memo[key] = self._eval(token_key, bybit_symbol)
+        return hit
+
+    def _eval(self, token_key: str, bybit_symbol: str) -> bool:
         base = _normalize_bybit_base(bybit_symbol)
-        candidates = [token_key, base, bybit_symbol]
+        candidates = [c for c in (str(token_key or "").upper(), base, str(bybit_symbol or "").upper()) if c]
+        symbols = self.symbols
         for c in candidates:
-            if not c:
-                continue
-            u = str(c).upper()
-            if u in self.symbols:
+            if c in symbols:
                 return True
-            for rx in self.regex:
-                if rx.search(u):
+        for rx in self._patterns:
+            for c in candidates:
+                if rx.search(c):
                     return True
         return False
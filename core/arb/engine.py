@@ -3,36 +3,58 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from decimal import Decimal, getcontext
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from connectors.jupiter import JupiterClient
-from core.calc import calc_mid_spread, coverage_pct, gross_cap_ok, net_profit, price_ratio_ok
+from connectors.jupiter import JupiterBatcher, JupiterClient
+from core.calc import coverage_pct, gross_cap_ok, net_profit, price_ratio_ok
 from core.fees import Thresholds
 from core.state import MarketState
-from core.vwap import simulate_buy_with_notional, simulate_sell_base
+from core.vwap import SimResult, simulate_buy_soa, simulate_sell_soa
 
 from .dedup import Dedup
 from .denylist import Denylist
 from .persistence import Persistence
 from .poller import QuotePoller
 from .stats import SkipStats
-from .types import Buttons, Signal
-from .utils import bybit_spot_url, from_raw, jup_swap_url_by_symbol, snapshot_book, to_raw
+from .types import Buttons, Signal, cfg_items
+from .utils import bybit_spot_url, from_raw, jup_swap_url_by_symbol, to_raw
 
 log = logging.getLogger("engine")
 
+# Signal sink; always awaited by the engine, so callers must pass an async callable
+OnSignal = Callable[[Signal], Awaitable[None]]
+
 if TYPE_CHECKING:
     from core.runtime_settings import RuntimeSettings
 getcontext().prec = 28
 
 # B-branch: allowed ratio of expected_raw / sell_amount_raw (tolerance for rounding)
-B_AMOUNT_RATIO_MIN = Decimal("0.997")
-B_AMOUNT_RATIO_MAX = Decimal("1.003")
+B_AMOUNT_RATIO_MIN = 0.997
+B_AMOUNT_RATIO_MAX = 1.003
 # B-branch requote prune: interval between prunes, max age of entries to keep
 B_REQUOTE_PRUNE_INTERVAL_SEC = 60.0
 B_REQUOTE_PRUNE_AGE_SEC = 600  # 10 min
+# Quote-level check bits; the lowest set bit picks the skip key (mint mismatch wins over impact)
+QF_MINT_BAD = 1
+QF_IMPACT_HI = 2
+A_QUOTE_SKIP = {QF_MINT_BAD: "A_skip_mint_mismatch", QF_IMPACT_HI: "A_skip_dex_impact"}
+B_QUOTE_SKIP = {QF_MINT_BAD: "B_skip_mint_mismatch", QF_IMPACT_HI: "B_skip_dex_impact"}
+# Floor for the dedup LRU size (4 entries per configured token otherwise)
+DEDUP_MIN_ENTRIES = 256
+
+
+class _TokenMeta(NamedTuple):
+    cfg: dict
+    mint: str
+    bybit_symbol: str
+    decimals: int
+    pump: bool
+    bad_decimals: bool
+    bybit_url: str
+    jup_buy_url: str
+    jup_sell_url: str
 
 
 class ArbEngine:
@@ -104,8 +126,9 @@ class ArbEngine:
         else:
             self.max_quote_age_ms = int(max_quote_age_ms)
 
-        # Debug instrumentation
+        # Debug instrumentation: windows are rolled once per tick in run(), drained by status loop
         self._skip_stats = SkipStats(window_sec=30)
+        self._debug_window: dict[str, int] | None = None
         self._stop = asyncio.Event()
         self._exchange_enabled = exchange_enabled_event  # None = always enabled
 
@@ -115,12 +138,20 @@ class ArbEngine:
         # B-branch sell re-quote throttling
         self._last_b_requote: dict[str, float] = {}
         self._last_b_requote_prune_ts: float = 0.0
+
+        # B-branch requotes from concurrent workers are coalesced into batched Jupiter calls
+        self.jup_batcher = JupiterBatcher(self.jup)
+
+        # Per-token static metadata, see _meta_for()
+        self._meta: dict[str, _TokenMeta] = {}
+        # token_key -> inputs of the last evaluation that settled with no valid branch; see _run_one_token()
+        self._last_tick_state: dict[str, tuple] = {}
         self.b_requote_cooldown_sec = 2.0
 
-        # Engine bounded concurrency (safe default)
+        # Engine bounded concurrency (safe default): the worker pool size in run()
         self.engine_concurrency = 64
-        self._engine_sem = asyncio.Semaphore(self.engine_concurrency)
-        self._engine_batch_mult = 4
+        # Tokens queued or being evaluated by a worker; see run()
+        self._in_flight: set[str] = set()
 
         # Quote poller component
         self._poller = QuotePoller(
@@ -140,6 +171,10 @@ class ArbEngine:
             exchange_enabled_event=exchange_enabled_event,
         )
 
+        self._build_evaluators()
+        # Required profit depends only on thresholds and notional: refreshed once per tick in run()
+        self._tick_required = self.thresholds.required_profit_usd(self.notional)
+
     async def stop(self) -> None:
         self._stop.set()
 
@@ -171,20 +206,157 @@ class ArbEngine:
         self._poller.poll_interval = float(settings.jupiter_poll_interval_sec)
         self._poller.max_quote_age_ms = int(max(5000, settings.jupiter_poll_interval_sec * 3 * 1000))
 
+        self._build_evaluators()
+
         log.info("Settings reloaded: min_profit=%.2f notional=%.0f", settings.min_profit_usd, settings.notional_usd)
 
     def drain_debug_stats(self) -> dict[str, int] | None:
-        return self._skip_stats.flush_if_due()
+        data = self._debug_window
+        self._debug_window = None
+        return data
+
+    def _roll_debug_stats(self, now: float) -> None:
+        data = self._skip_stats.flush_if_due(now)
+        if data is None:
+            return
+        if self._debug_window is None:
+            self._debug_window = data
+            return
+        # Status loop slower than the window: merge so no counts are lost
+        for k, v in data.items():
+            self._debug_window[k] = self._debug_window.get(k, 0) + v
 
     def _dbg_inc(self, k: str, n: int = 1) -> None:
         self._skip_stats.inc(k, n)
 
     @staticmethod
     def _is_pump_mint(mint: str) -> bool:
-        try:
-            return str(mint).lower().endswith("pump")
-        except Exception:
-            return False
+        # Lowercase only the 4-char tail, not the whole ~44-char mint
+        return len(mint) >= 4 and mint[-4:].lower() == "pump"
+
+    def _build_evaluators(self) -> None:
+        """
+        Specialize the A/B predicate chains for the current thresholds.
+
+        Thresholds only change in reload_settings(), so they are captured once as
+        closure locals (LOAD_DEREF instead of LOAD_ATTR per comparison) and the
+        closures are rebuilt there. Each evaluator returns (skip_key, None) on the
+        first failed guard, otherwise (None, results).
+
+        Gates (impact, slippage, coverage, ratios, gross cap) compare floats; Decimal is
+        kept for the amounts that end up in the signal (token_out, stable_out, profit).
+        """
+        notional = self.notional
+        notional_f = float(notional)
+        stable_mint = self.stable_mint
+        stable_decimals = self.stable_decimals
+        max_impact = float(self.max_dex_price_impact_pct)
+        max_cex_slip = float(self.max_cex_slippage_bps)
+        min_cov = float(self.min_depth_coverage_pct)
+        max_ratio = float(self.max_price_ratio)
+        max_gross = float(self.max_gross_profit_pct)
+        max_quote_age_ms = self.max_quote_age_ms
+        # Float mirrors for the gates evaluated inline in _run_one_token
+        self._max_spread_bps_f = float(self.max_spread_bps)
+        self._max_dex_price_impact_pct_f = max_impact
+        # New thresholds can turn a settled no-signal token into a candidate
+        self._last_tick_state.clear()
+
+        # Mint/impact verdicts depend only on the quote object, which lives across many ticks:
+        # computed once per quote (identity-checked, keyed by token mint) as a bit mask.
+        # The maps are rebuilt with the closures, so a threshold change re-evaluates them.
+        a_flags: dict[str, tuple[Any, int]] = {}
+        b_flags: dict[str, tuple[Any, int]] = {}
+
+        def quote_flags(cache: dict[str, tuple[Any, int]], q, mint: str, in_mint: str, out_mint: str) -> int:
+            hit = cache.get(mint)
+            if hit is not None and hit[0] is q:
+                return hit[1]
+            flags = 0
+            if q.input_mint != in_mint or q.output_mint != out_mint:
+                flags |= QF_MINT_BAD
+            if float(q.price_impact_pct) > max_impact:
+                flags |= QF_IMPACT_HI
+            cache[mint] = (q, flags)
+            return flags
+
+        def eval_a(j_buy, mint: str, decimals: int, bids_p, bids_s, mid: float, required: Decimal):
+            if not j_buy:
+                return "A_no_jup_buy_quote", None
+            flags = quote_flags(a_flags, j_buy, mint, stable_mint, mint)
+            if flags:
+                return A_QUOTE_SKIP[flags & -flags], None
+            token_out = from_raw(int(j_buy.out_amount_raw), decimals)
+            if token_out <= 0:
+                return "A_skip_token_out_le0", None
+            token_out_f = float(token_out)
+            sim_sell = simulate_sell_soa(bids_p, bids_s, token_out_f)
+            if sim_sell is None:
+                return "A_skip_sim_sell_none", None
+            if coverage_pct(sim_sell.base_out, token_out_f) < min_cov:
+                return "A_skip_depth", None
+            if sim_sell.slippage_bps > max_cex_slip:
+                return "A_skip_cex_slip", None
+            if sim_sell.quote_out <= 0:
+                return "A_skip_stable_out_le0", None
+            if not price_ratio_ok(notional_f / token_out_f, mid, max_ratio):
+                return "A_skip_price_ratio", None
+            if not gross_cap_ok(sim_sell.quote_out, notional_f, max_gross):
+                return "A_skip_gross_cap", None
+            # Back to Decimal only for the amounts that reach the signal
+            stable_out = Decimal(repr(sim_sell.quote_out))
+            profit = net_profit(stable_out, notional, required)
+            if profit <= 0:
+                return "A_skip_profit_le0", None
+            return None, (token_out, sim_sell, stable_out, profit)
+
+        def eval_b_book(asks_p, asks_s):
+            sim_buy = simulate_buy_soa(asks_p, asks_s, notional_f)
+            if sim_buy is None:
+                return "B_skip_sim_buy_none", None
+            if coverage_pct(sim_buy.quote_out, notional_f) < min_cov:
+                return "B_skip_depth", None
+            if sim_buy.slippage_bps > max_cex_slip:
+                return "B_skip_cex_slip", None
+            if sim_buy.base_out <= 0:
+                return "B_skip_token_out_le0", None
+            return None, (sim_buy, Decimal(repr(sim_buy.base_out)))
+
+        def eval_b_sell(
+            j_sell, mint: str, now_ms: int, sell_updated_ms: int, sell_amount_raw: int, expected_raw: int
+        ) -> str | None:
+            """Return the re-quote reason key, or None if the cached sell quote is usable."""
+            if not j_sell:
+                return "B_sell_missing_requote"
+            flags = quote_flags(b_flags, j_sell, mint, mint, stable_mint)
+            if flags:
+                return B_QUOTE_SKIP[flags & -flags]
+            if not sell_updated_ms or (now_ms - sell_updated_ms) > max_quote_age_ms:
+                return "B_sell_stale_requote"
+            if sell_amount_raw <= 0:
+                return "B_sell_amount_raw_missing_requote"
+            if not (B_AMOUNT_RATIO_MIN <= expected_raw / sell_amount_raw <= B_AMOUNT_RATIO_MAX):
+                return "B_amount_mismatch_requote"
+            return None
+
+        def eval_b(j_sell, token_out: Decimal, mid: float, required: Decimal):
+            stable_out = from_raw(int(j_sell.out_amount_raw), stable_decimals)
+            if stable_out <= 0:
+                return "B_skip_stable_out_le0", None
+            stable_out_f = float(stable_out)
+            if not price_ratio_ok(stable_out_f / float(token_out), mid, max_ratio):
+                return "B_skip_price_ratio", None
+            if not gross_cap_ok(stable_out_f, notional_f, max_gross):
+                return "B_skip_gross_cap", None
+            profit = net_profit(stable_out, notional, required)
+            if profit <= 0:
+                return "B_skip_profit_le0", None
+            return None, (stable_out, profit)
+
+        self._eval_a = eval_a
+        self._eval_b_book = eval_b_book
+        self._eval_b_sell = eval_b_sell
+        self._eval_b = eval_b
 
     async def quote_poller(self) -> None:
         await self._poller.run()
@@ -194,7 +366,7 @@ class ArbEngine:
         self.persistence.hit(f"{token_key}:B", False)
 
     def _prune_b_requote(self) -> None:
-        now = time.time()
+        now = time.monotonic()
         if (now - self._last_b_requote_prune_ts) < B_REQUOTE_PRUNE_INTERVAL_SEC:
             return
         self._last_b_requote_prune_ts = now
@@ -202,14 +374,117 @@ class ArbEngine:
         stale = [k for k, ts in self._last_b_requote.items() if ts < cutoff]
         for k in stale:
             del self._last_b_requote[k]
+        # Dedup keys are per token and direction: bound them by the current token set
+        self.dedup.max_entries = max(DEDUP_MIN_ENTRIES, 4 * len(self.token_cfgs))
+        # Same cadence for token metadata of tokens dropped from token_cfgs
+        stale = [k for k in self._meta if k not in self.token_cfgs]
+        for k in stale:
+            del self._meta[k]
+        stale = [k for k in self._last_tick_state if k not in self.token_cfgs]
+        for k in stale:
+            del self._last_tick_state[k]
+
+    def _meta_for(self, token_key: str, cfg: dict) -> _TokenMeta:
+        """
+        Parsed config fields and URLs of a token. token_cfgs is rebuilt in place by
+        QuarantineManager with fresh cfg dicts, so the entry is keyed on cfg identity.
+        Denylist membership is not cached here: Denylist memoizes it per version.
+        """
+        meta = self._meta.get(token_key)
+        if meta is not None and meta.cfg is cfg:
+            return meta
+        mint = str(cfg.get("mint", ""))
+        bybit_symbol = str(cfg.get("bybit_symbol", ""))
+        decimals = int(cfg.get("decimals", 0) or 0)
+        meta = _TokenMeta(
+            cfg=cfg,
+            mint=mint,
+            bybit_symbol=bybit_symbol,
+            decimals=decimals,
+            pump=self._is_pump_mint(mint),
+            bad_decimals=decimals <= 0 or decimals > 18,
+            bybit_url=bybit_spot_url(bybit_symbol),
+            jup_buy_url=jup_swap_url_by_symbol(bybit_symbol, buy=True),
+            jup_sell_url=jup_swap_url_by_symbol(bybit_symbol, buy=False),
+        )
+        self._meta[token_key] = meta
+        return meta
 
-    async def _run_one_token(self, token_key: str, cfg: dict, on_signal: Callable[[Signal], Any]) -> None:
+    def _format_signal_a(
+        self,
+        key: str,
+        token_key: str,
+        meta: _TokenMeta,
+        token_out: Decimal,
+        sim_sell: SimResult,
+        stable_out: Decimal,
+        profit: Decimal,
+        required: Decimal,
+    ) -> Signal:
+        """
+        Jupiter -> Bybit alert; only built once persistence and dedup have passed.
+        Display values are formatted as floats (Decimal.__format__ is much slower);
+        the Signal itself keeps the Decimal profit and notional.
+        """
+        notional_f = float(self.notional)
+        profit_f = float(profit)
+        text = (
+            f"🚨 <b>АРБИТРАЖ</b> • <b>{token_key}</b>\n"
+            f"Маршрут: <b>Jupiter → Bybit</b>\n"
+            f"Объём: <code>{notional_f:.0f} USDC</code>\n"
+            f"Ожидаемый выход: <code>{float(stable_out):.2f} USDT</code>\n"
+            f"Чистая прибыль: <b>{profit_f:.2f}$</b> (<b>{profit_f / notional_f * 100.0:.2f}%</b>)\n"
+            f"Комиссии/запас: <code>{float(required):.2f}$</code>\n"
+            f"Цена на Jupiter: <code>{notional_f / float(token_out):.6f}$</code>\n"
+            f"Цена на Bybit: <code>{float(sim_sell.avg_price):.6f}$</code>"
+        )
+        buttons: Buttons = [
+            [
+                ("🟢 Купить на Jupiter", meta.jup_buy_url),
+                ("🟠 Продать на Bybit", meta.bybit_url),
+            ]
+        ]
+        return Signal(key, token_key, "JUP->BYBIT", profit, self.notional, text, buttons)
+
+    def _format_signal_b(
+        self,
+        key: str,
+        token_key: str,
+        meta: _TokenMeta,
+        token_out: Decimal,
+        sim_buy: SimResult,
+        stable_out: Decimal,
+        profit: Decimal,
+        required: Decimal,
+    ) -> Signal:
+        """Bybit -> Jupiter alert; see _format_signal_a() for the float formatting."""
+        notional_f = float(self.notional)
+        profit_f = float(profit)
+        stable_out_f = float(stable_out)
+        text = (
+            f"🚨 <b>АРБИТРАЖ</b> • <b>{token_key}</b>\n"
+            f"Маршрут: <b>Bybit → Jupiter</b>\n"
+            f"Объём: <code>{notional_f:.0f} USDC</code>\n"
+            f"Ожидаемый выход: <code>{stable_out_f:.2f} USDT</code>\n"
+            f"Чистая прибыль: <b>{profit_f:.2f}$</b> (<b>{profit_f / notional_f * 100.0:.2f}%</b>)\n"
+            f"Комиссии/запас: <code>{float(required):.2f}$</code>\n"
+            f"Цена на Bybit: <code>{float(sim_buy.avg_price):.6f}$</code>\n"
+            f"Цена на Jupiter: <code>{stable_out_f / float(token_out):.6f}$</code>"
+        )
+        buttons: Buttons = [
+            [
+                ("🟠 Купить на Bybit", meta.bybit_url),
+                ("🟢 Продать на Jupiter", meta.jup_sell_url),
+            ]
+        ]
+        return Signal(key, token_key, "BYBIT->JUP", profit, self.notional, text, buttons)
+
+    async def _run_one_token(self, token_key: str, cfg: dict, on_signal: OnSignal) -> None:
         try:
-            mint = str(cfg.get("mint", ""))
-            bybit_symbol = str(cfg.get("bybit_symbol", ""))
-            decimals = int(cfg.get("decimals", 0) or 0)
+            meta = self._meta_for(token_key, cfg)
+            mint, bybit_symbol, decimals = meta.mint, meta.bybit_symbol, meta.decimals
 
-            if self._is_pump_mint(mint):
+            if meta.pump:
                 self._dbg_inc("skip_pump_mint")
                 self._reset_persistence(token_key)
                 return
@@ -217,134 +492,84 @@ class ArbEngine:
                 self._dbg_inc("skip_denied")
                 self._reset_persistence(token_key)
                 return
-            if decimals <= 0 or decimals > 18:
+            if meta.bad_decimals:
                 self._dbg_inc("skip_bad_decimals")
                 self._reset_persistence(token_key)
                 return
 
-            ob = await self.state.get_orderbook(bybit_symbol)
+            ob = self.state.get_orderbook(bybit_symbol)
             if ob is None or not ob.bids or not ob.asks:
                 self._dbg_inc("skip_no_ob")
                 self._reset_persistence(token_key)
                 return
-            if ob.age_ms() > self.max_ob_age_ms:
+            # One clock read per token: book age and quote ages below share it
+            now_ms = self.state.now_ms()
+            if ob.age_ms(now_ms) > self.max_ob_age_ms:
                 self._dbg_inc("skip_ob_stale")
                 self._reset_persistence(token_key)
                 return
 
-            bids, asks = snapshot_book(ob)
-            mid, spread_bps = calc_mid_spread(bids, asks)
-            if mid is None or spread_bps is None:
+            bids_p, bids_s, asks_p, asks_s = ob.float_levels()
+            best_bid, best_ask = bids_p[0], asks_p[0]
+            if best_bid <= 0 or best_ask <= 0:
                 self._dbg_inc("skip_no_mid")
                 self._reset_persistence(token_key)
                 return
-            if spread_bps > self.max_spread_bps:
+            mid = (best_bid + best_ask) / 2.0
+            if (best_ask - best_bid) / mid * 10000.0 > self._max_spread_bps_f:
                 self._dbg_inc("skip_spread")
                 self._reset_persistence(token_key)
                 return
 
-            qp = await self.state.get_quote_pair(token_key)
-            now_ms = self.state.now_ms()
+            qp = self.state.get_quote_pair(token_key)
 
-            # Snapshot quotes under lock, then use copies outside. Poller may update qp
-            # concurrently; using j_buy/j_sell avoids race and keeps evaluation consistent.
-            async with qp.lock:
-                if qp.buy_quote is not None and (now_ms - int(qp.buy_updated_ms or 0)) > self.max_quote_age_ms:
-                    self._dbg_inc("skip_stale_buy_quote")
-                    qp.buy_quote = None
-                    qp.buy_updated_ms = 0
+            # Each side is one immutable tuple: a single read is a consistent snapshot, and
+            # with no await until the writes below, clearing a stale side cannot race the poller.
+            j_buy, buy_updated_ms = qp.buy
+            j_sell, sell_updated_ms, sell_amount_raw = qp.sell
 
-                if qp.sell_quote is not None and (now_ms - int(qp.sell_updated_ms or 0)) > self.max_quote_age_ms:
-                    self._dbg_inc("skip_stale_sell_quote")
-                    qp.sell_quote = None
-                    qp.sell_updated_ms = 0
-                    qp.sell_amount_raw = 0
+            if j_buy is not None and (now_ms - buy_updated_ms) > self.max_quote_age_ms:
+                self._dbg_inc("skip_stale_buy_quote")
+                qp.set_buy(None, 0)
+                j_buy = None
 
-                j_buy = qp.buy_quote
-                j_sell = qp.sell_quote
-                sell_amount_raw = int(qp.sell_amount_raw or 0)
-                sell_updated_ms = int(qp.sell_updated_ms or 0)
+            if j_sell is not None and (now_ms - sell_updated_ms) > self.max_quote_age_ms:
+                self._dbg_inc("skip_stale_sell_quote")
+                qp.set_sell(None, 0, 0)
+                j_sell, sell_updated_ms, sell_amount_raw = None, 0, 0
 
-            required = self.thresholds.required_profit_usd(self.notional)
+            required = self._tick_required
 
-            bybit_url = bybit_spot_url(bybit_symbol)
-            jup_buy_url = jup_swap_url_by_symbol(bybit_symbol, buy=True)
-            jup_sell_url = jup_swap_url_by_symbol(bybit_symbol, buy=False)
+            # Unchanged book and quotes after a tick that settled with no valid branch would
+            # produce the same skips again: persistence is already reset, nothing to send.
+            tick_state = (id(ob), ob.version, buy_updated_ms, sell_updated_ms, required)
+            if self._last_tick_state.get(token_key) == tick_state:
+                self._dbg_inc("skip_unchanged")
+                return
 
             # ---------- A) Jupiter -> Bybit ----------
             a_key = f"{token_key}:A"
             a_valid = False
 
-            if not j_buy:
-                self._dbg_inc("A_no_jup_buy_quote")
-            elif j_buy.output_mint != mint or j_buy.input_mint != self.stable_mint:
-                self._dbg_inc("A_skip_mint_mismatch")
-            elif Decimal(str(j_buy.price_impact_pct)) > self.max_dex_price_impact_pct:
-                self._dbg_inc("A_skip_dex_impact")
+            skip, a_res = self._eval_a(j_buy, mint, decimals, bids_p, bids_s, mid, required)
+            if skip is not None:
+                self._dbg_inc(skip)
             else:
-                token_out = from_raw(int(j_buy.out_amount_raw), decimals)
-                if token_out <= 0:
-                    self._dbg_inc("A_skip_token_out_le0")
+                token_out, sim_sell, stable_out, profit = a_res
+                a_valid = True
+                ready = self.persistence.hit(a_key, True)
+                if not ready:
+                    self._dbg_inc("A_skip_persistence")
                 else:
-                    sim_sell = simulate_sell_base(bids, token_out)
-                    if sim_sell is None:
-                        self._dbg_inc("A_skip_sim_sell_none")
+                    key = f"{token_key}:JUP->BYBIT:{int(self.notional)}"
+                    if not self.dedup.can_send(key, profit):
+                        self._dbg_inc("A_skip_dedup")
                     else:
-                        depth_cov = coverage_pct(Decimal(str(sim_sell.base_out)), token_out)
-                        if depth_cov < self.min_depth_coverage_pct:
-                            self._dbg_inc("A_skip_depth")
-                        elif Decimal(str(sim_sell.slippage_bps)) > self.max_cex_slippage_bps:
-                            self._dbg_inc("A_skip_cex_slip")
-                        else:
-                            stable_out = Decimal(str(sim_sell.quote_out))
-                            if stable_out <= 0:
-                                self._dbg_inc("A_skip_stable_out_le0")
-                            else:
-                                jup_implied = self.notional / token_out
-                                if not price_ratio_ok(jup_implied, mid, self.max_price_ratio):
-                                    self._dbg_inc("A_skip_price_ratio")
-                                elif not gross_cap_ok(stable_out, self.notional, self.max_gross_profit_pct):
-                                    self._dbg_inc("A_skip_gross_cap")
-                                else:
-                                    profit = net_profit(stable_out, self.notional, required)
-                                    if profit <= 0:
-                                        self._dbg_inc("A_skip_profit_le0")
-                                    else:
-                                        a_valid = True
-                                        ready = self.persistence.hit(a_key, True)
-                                        if not ready:
-                                            self._dbg_inc("A_skip_persistence")
-                                        else:
-                                            key = f"{token_key}:JUP->BYBIT:{int(self.notional)}"
-                                            if not self.dedup.can_send(key, profit):
-                                                self._dbg_inc("A_skip_dedup")
-                                            else:
-                                                net_pct = (profit / self.notional) * Decimal("100")
-                                                price_jup = self.notional / token_out
-                                                price_bybit = sim_sell.avg_price
-                                                text = (
-                                                    f"🚨 <b>АРБИТРАЖ</b> • <b>{token_key}</b>\n"
-                                                    f"Маршрут: <b>Jupiter → Bybit</b>\n"
-                                                    f"Объём: <code>{self.notional:.0f} USDC</code>\n"
-                                                    f"Ожидаемый выход: <code>{stable_out:.2f} USDT</code>\n"
-                                                    f"Чистая прибыль: <b>{profit:.2f}$</b> (<b>{net_pct:.2f}%</b>)\n"
-                                                    f"Комиссии/запас: <code>{required:.2f}$</code>\n"
-                                                    f"Цена на Jupiter: <code>{price_jup:.6f}$</code>\n"
-                                                    f"Цена на Bybit: <code>{price_bybit:.6f}$</code>"
-                                                )
-                                                buttons: Buttons = [
-                                                    [
-                                                        ("🟢 Купить на Jupiter", jup_buy_url),
-                                                        ("🟠 Продать на Bybit", bybit_url),
-                                                    ]
-                                                ]
-                                                sig = Signal(
-                                                    key, token_key, "JUP->BYBIT", profit, self.notional, text, buttons
-                                                )
-                                                self.dedup.mark_sent(key, profit)
-                                                res = on_signal(sig)
-                                                if asyncio.iscoroutine(res):
-                                                    await res
+                        sig = self._format_signal_a(
+                            key, token_key, meta, token_out, sim_sell, stable_out, profit, required
+                        )
+                        self.dedup.mark_sent(key, profit)
+                        await on_signal(sig)
 
             if not a_valid:
                 self.persistence.hit(a_key, False)
@@ -352,154 +577,120 @@ class ArbEngine:
             # ---------- B) Bybit -> Jupiter ----------
             b_key = f"{token_key}:B"
             b_valid = False
+            requote_reason = None
 
-            sim_buy2 = simulate_buy_with_notional(asks, self.notional)
-            if sim_buy2 is None:
-                self._dbg_inc("B_skip_sim_buy_none")
+            skip, b_book = self._eval_b_book(asks_p, asks_s)
+            if skip is not None:
+                self._dbg_inc(skip)
             else:
-                depth_cov2 = coverage_pct(Decimal(str(sim_buy2.quote_out)), self.notional)
-                if depth_cov2 < self.min_depth_coverage_pct:
-                    self._dbg_inc("B_skip_depth")
-                elif Decimal(str(sim_buy2.slippage_bps)) > self.max_cex_slippage_bps:
-                    self._dbg_inc("B_skip_cex_slip")
-                else:
-                    token_out2 = Decimal(str(sim_buy2.base_out))
-                    if token_out2 <= 0:
-                        self._dbg_inc("B_skip_token_out_le0")
+                sim_buy2, token_out2 = b_book
+                expected_raw = to_raw(token_out2, decimals)
+
+                requote_reason = self._eval_b_sell(j_sell, mint, now_ms, sell_updated_ms, sell_amount_raw, expected_raw)
+                if requote_reason is not None:
+                    self._dbg_inc(requote_reason)
+                    now = time.monotonic()
+                    last = self._last_b_requote.get(token_key)
+                    if last is not None and (now - last) < self.b_requote_cooldown_sec:
+                        self._dbg_inc("B_skip_requote_cooldown")
                     else:
-                        expected_raw = to_raw(token_out2, decimals)
-
-                        need_requote = False
-                        if not j_sell:
-                            self._dbg_inc("B_sell_missing_requote")
-                            need_requote = True
-                        elif j_sell.input_mint != mint or j_sell.output_mint != self.stable_mint:
-                            self._dbg_inc("B_skip_mint_mismatch")
-                            need_requote = True
-                        elif Decimal(str(j_sell.price_impact_pct)) > self.max_dex_price_impact_pct:
-                            self._dbg_inc("B_skip_dex_impact")
-                            need_requote = True
+                        self._last_b_requote[token_key] = now
+                        fresh_sell = await self.jup_batcher.request(mint, self.stable_mint, int(expected_raw))
+                        if fresh_sell is None:
+                            self._dbg_inc("B_requote_none")
+                        elif float(fresh_sell.price_impact_pct) > self._max_dex_price_impact_pct_f:
+                            self._dbg_inc("B_requote_skip_dex_impact")
                         else:
-                            if not sell_updated_ms or (now_ms - sell_updated_ms) > self.max_quote_age_ms:
-                                self._dbg_inc("B_sell_stale_requote")
-                                need_requote = True
-                            elif sell_amount_raw <= 0:
-                                self._dbg_inc("B_sell_amount_raw_missing_requote")
-                                need_requote = True
-                            else:
-                                ratio = Decimal(expected_raw) / Decimal(sell_amount_raw)
-                                if not (B_AMOUNT_RATIO_MIN <= ratio <= B_AMOUNT_RATIO_MAX):
-                                    self._dbg_inc("B_amount_mismatch_requote")
-                                    need_requote = True
-
-                        if need_requote:
-                            now = time.time()
-                            last = self._last_b_requote.get(token_key, 0.0)
-                            if (now - last) < self.b_requote_cooldown_sec:
-                                self._dbg_inc("B_skip_requote_cooldown")
-                            else:
-                                self._last_b_requote[token_key] = now
-                                fresh_sell = await self.jup.quote_exact_in(mint, self.stable_mint, int(expected_raw))
-                                if fresh_sell is None:
-                                    self._dbg_inc("B_requote_none")
-                                elif Decimal(str(fresh_sell.price_impact_pct)) > self.max_dex_price_impact_pct:
-                                    self._dbg_inc("B_requote_skip_dex_impact")
-                                else:
-                                    j_sell = fresh_sell
-                                    sell_amount_raw = int(expected_raw)
-                                    sell_updated_ms = self.state.now_ms()
-                                    async with qp.lock:
-                                        qp.sell_quote = fresh_sell
-                                        qp.sell_updated_ms = sell_updated_ms
-                                        qp.sell_amount_raw = sell_amount_raw
-
-                        if not j_sell:
-                            self._dbg_inc("B_skip_no_sell_quote_after_requote")
+                            j_sell = fresh_sell
+                            sell_amount_raw = int(expected_raw)
+                            sell_updated_ms = self.state.now_ms()
+                            qp.set_sell(fresh_sell, sell_updated_ms, sell_amount_raw)
+
+                if not j_sell:
+                    self._dbg_inc("B_skip_no_sell_quote_after_requote")
+                else:
+                    skip, b_res = self._eval_b(j_sell, token_out2, mid, required)
+                    if skip is not None:
+                        self._dbg_inc(skip)
+                    else:
+                        stable_out2, profit2 = b_res
+                        b_valid = True
+                        ready2 = self.persistence.hit(b_key, True)
+                        if not ready2:
+                            self._dbg_inc("B_skip_persistence")
                         else:
-                            stable_out2 = from_raw(int(j_sell.out_amount_raw), self.stable_decimals)
-                            if stable_out2 <= 0:
-                                self._dbg_inc("B_skip_stable_out_le0")
+                            key2 = f"{token_key}:BYBIT->JUP:{int(self.notional)}"
+                            if not self.dedup.can_send(key2, profit2):
+                                self._dbg_inc("B_skip_dedup")
                             else:
-                                jup_implied2 = stable_out2 / token_out2
-                                if not price_ratio_ok(jup_implied2, mid, self.max_price_ratio):
-                                    self._dbg_inc("B_skip_price_ratio")
-                                elif not gross_cap_ok(stable_out2, self.notional, self.max_gross_profit_pct):
-                                    self._dbg_inc("B_skip_gross_cap")
-                                else:
-                                    profit2 = net_profit(stable_out2, self.notional, required)
-                                    if profit2 <= 0:
-                                        self._dbg_inc("B_skip_profit_le0")
-                                    else:
-                                        b_valid = True
-                                        ready2 = self.persistence.hit(b_key, True)
-                                        if not ready2:
-                                            self._dbg_inc("B_skip_persistence")
-                                        else:
-                                            key2 = f"{token_key}:BYBIT->JUP:{int(self.notional)}"
-                                            if not self.dedup.can_send(key2, profit2):
-                                                self._dbg_inc("B_skip_dedup")
-                                            else:
-                                                net_pct2 = (profit2 / self.notional) * Decimal("100")
-                                                price_bybit2 = sim_buy2.avg_price
-                                                price_jup2 = stable_out2 / token_out2
-                                                text2 = (
-                                                    f"🚨 <b>АРБИТРАЖ</b> • <b>{token_key}</b>\n"
-                                                    f"Маршрут: <b>Bybit → Jupiter</b>\n"
-                                                    f"Объём: <code>{self.notional:.0f} USDC</code>\n"
-                                                    f"Ожидаемый выход: <code>{stable_out2:.2f} USDT</code>\n"
-                                                    f"Чистая прибыль: <b>{profit2:.2f}$</b> (<b>{net_pct2:.2f}%</b>)\n"
-                                                    f"Комиссии/запас: <code>{required:.2f}$</code>\n"
-                                                    f"Цена на Bybit: <code>{price_bybit2:.6f}$</code>\n"
-                                                    f"Цена на Jupiter: <code>{price_jup2:.6f}$</code>"
-                                                )
-                                                buttons2: Buttons = [
-                                                    [
-                                                        ("🟠 Купить на Bybit", bybit_url),
-                                                        ("🟢 Продать на Jupiter", jup_sell_url),
-                                                    ]
-                                                ]
-                                                sig2 = Signal(
-                                                    key2,
-                                                    token_key,
-                                                    "BYBIT->JUP",
-                                                    profit2,
-                                                    self.notional,
-                                                    text2,
-                                                    buttons2,
-                                                )
-                                                self.dedup.mark_sent(key2, profit2)
-                                                res2 = on_signal(sig2)
-                                                if asyncio.iscoroutine(res2):
-                                                    await res2
+                                sig2 = self._format_signal_b(
+                                    key2, token_key, meta, token_out2, sim_buy2, stable_out2, profit2, required
+                                )
+                                self.dedup.mark_sent(key2, profit2)
+                                await on_signal(sig2)
 
             if not b_valid:
                 self.persistence.hit(b_key, False)
 
+            # Only settled ticks are memoized: a valid branch advances persistence/dedup and a
+            # requote is retried on its cooldown, so both must be re-evaluated next tick.
+            if a_valid or b_valid or requote_reason is not None:
+                self._last_tick_state.pop(token_key, None)
+            else:
+                self._last_tick_state[token_key] = tick_state
+
         except Exception as e:
+            self._last_tick_state.pop(token_key, None)
             self._dbg_inc("engine_error")
             log.exception("engine error token=%s: %s", token_key, e)
 
-    async def _run_one_bounded(self, token_key: str, cfg: dict, on_signal: Callable[[Signal], Any]) -> None:
-        async with self._engine_sem:
-            await self._run_one_token(token_key, cfg, on_signal)
-
-    async def run(self, on_signal: Callable[[Signal], Any]) -> None:
-        while not self._stop.is_set():
-            if self._exchange_enabled is not None and not self._exchange_enabled.is_set():
-                await asyncio.sleep(1)
-                continue
-            self._prune_b_requote()
-            started = time.time()
-            items = list(self.token_cfgs.items())
-            batch_size = max(1, int(self.engine_concurrency) * int(self._engine_batch_mult))
-
-            for i in range(0, len(items), batch_size):
-                chunk = items[i : i + batch_size]
-                tasks = [
-                    asyncio.create_task(self._run_one_bounded(token_key, cfg, on_signal)) for token_key, cfg in chunk
-                ]
-                await asyncio.gather(*tasks, return_exceptions=True)
-                await asyncio.sleep(0)
-
-            elapsed = time.time() - started
-            await asyncio.sleep(max(0.0, self.tick_sleep - elapsed))
+    async def _engine_worker(self, queue: asyncio.Queue[tuple[str, dict]], on_signal: OnSignal) -> None:
+        while True:
+            token_key, cfg = await queue.get()
+            try:
+                await self._run_one_token(token_key, cfg, on_signal)
+            finally:
+                self._in_flight.discard(token_key)
+                queue.task_done()
+
+    async def run(self, on_signal: OnSignal) -> None:
+        # Persistent workers drain a per-tick queue: a token awaiting a B-branch requote
+        # holds one worker while the rest keep flowing, with no per-token task churn.
+        # A tick waits at most tick_sleep for its tokens; stragglers keep running and are
+        # not re-queued until they finish, so one slow requote never stalls the next tick.
+        queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue()
+        self._in_flight.clear()
+        workers = [
+            asyncio.create_task(self._engine_worker(queue, on_signal), name=f"engine_worker_{i}")
+            for i in range(max(1, int(self.engine_concurrency)))
+        ]
+
+        try:
+            while not self._stop.is_set():
+                if self._exchange_enabled is not None and not self._exchange_enabled.is_set():
+                    await asyncio.sleep(1)
+                    continue
+                self._prune_b_requote()
+                started = time.monotonic()
+                self._tick_required = self.thresholds.required_profit_usd(self.notional)
+                in_flight = self._in_flight
+                for item in cfg_items(self.token_cfgs):
+                    if item[0] in in_flight:
+                        self._dbg_inc("skip_in_flight")
+                        continue
+                    in_flight.add(item[0])
+                    queue.put_nowait(item)
+                try:
+                    await asyncio.wait_for(queue.join(), timeout=self.tick_sleep)
+                except asyncio.TimeoutError:
+                    pass
+
+                self._roll_debug_stats(time.monotonic())
+
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, self.tick_sleep - elapsed))
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.jup_batcher.aclose()
@@ -4,6 +4,9 @@ from __future__ import annotations
 class Persistence:
     """
     Require N consecutive 'ok' hits before triggering a signal.
+
+    Only keys in the middle of a streak are stored (a zero count is the same as
+    no entry), so the map stays bounded by the tokens currently passing.
     """
 
     def __init__(self, hits: int) -> None:
@@ -12,10 +15,11 @@ class Persistence:
 
     def hit(self, key: str, ok: bool) -> bool:
         if not ok:
-            self._cnt[key] = 0
+            self._cnt.pop(key, None)
             return False
-        self._cnt[key] = self._cnt.get(key, 0) + 1
-        if self._cnt[key] >= self.hits:
-            self._cnt[key] = 0  # reset after success to bound memory
+        n = self._cnt.get(key, 0) + 1
+        if n >= self.hits:
+            self._cnt.pop(key, None)  # reset after success
             return True
+        self._cnt[key] = n
         return False
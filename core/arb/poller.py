@@ -2,19 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import time
+from collections import defaultdict
 from decimal import Decimal
 
-from connectors.jupiter import JupiterClient
-from core.calc import calc_mid_spread
+from connectors.jupiter import JupiterClient, JupQuote
 from core.state import MarketState
 
 from .denylist import Denylist
 from .stats import SkipStats
-from .utils import snapshot_book, to_raw
+from .types import cfg_items
+from .utils import best_levels, to_raw
 
 log = logging.getLogger("engine")
 
+# Upper bound for per-token exponential poll backoff
+POLL_BACKOFF_CAP_SEC = 300.0
+# Batch concurrency backpressure: halve when more than this share of a cycle's quotes fail
+POLL_ADAPT_FAIL_RATIO = 0.5
+POLL_ADAPT_MIN_BATCH = 4
+
 
 class QuotePoller:
     """
@@ -37,7 +45,6 @@ class QuotePoller:
         poll_interval_sec: float,
         max_quote_age_ms: int,
         poll_concurrency: int = 24,
-        poll_batch_mult: int = 4,
         poll_jitter_ratio: float = 0.15,
         backoff_on_none_sec: float = 5.0,
         backoff_on_err_sec: float = 10.0,
@@ -51,7 +58,7 @@ class QuotePoller:
 
         self.stable_mint = str(stable_mint)
         self.stable_decimals = int(stable_decimals)
-        self.notional = Decimal(str(notional))
+        self.notional = notional
 
         self.denylist = denylist
         self.max_spread_bps = Decimal(str(max_spread_bps))
@@ -60,122 +67,223 @@ class QuotePoller:
         self.max_quote_age_ms = int(max_quote_age_ms)
 
         self.poll_concurrency = int(poll_concurrency)
-        self._poll_batch_mult = int(poll_batch_mult)
+        # Effective batch concurrency: halved while Jupiter mostly fails, regrown by one per healthy cycle.
+        # A plain int is enough: the cap is fixed for the length of one batch call and only changes between cycles.
+        self._poll_cap = self.poll_concurrency
         self.poll_jitter_ratio = float(poll_jitter_ratio)
 
+        # token_key -> (cfg, mint, bybit_symbol, decimals, is_pump, bad_decimals); see _prepared_for()
+        self._prepared: dict[str, tuple[dict, str, str, int, bool, bool]] = {}
+
         self._poll_backoff_until: dict[str, float] = {}
+        self._poll_fail_count: dict[str, int] = {}
         self.backoff_on_none_sec = float(backoff_on_none_sec)
         self.backoff_on_err_sec = float(backoff_on_err_sec)
 
         self._skip_stats = skip_stats
+        # Skip reasons counted locally during a cycle and handed to SkipStats in one inc_many()
+        self._pending_skips: defaultdict[str, int] = defaultdict(int)
         self._stop = stop_event or asyncio.Event()
         self._exchange_enabled = exchange_enabled_event  # None = always enabled
 
+    @property
+    def notional(self) -> Decimal:
+        return self._notional
+
+    @notional.setter
+    def notional(self, value: Decimal) -> None:
+        # stable_raw only depends on notional: recompute here instead of on every poll
+        self._notional = Decimal(str(value))
+        self._stable_raw = to_raw(self._notional, self.stable_decimals)
+
+    @property
+    def max_spread_bps(self) -> Decimal:
+        return self._max_spread_bps
+
+    @max_spread_bps.setter
+    def max_spread_bps(self, value: Decimal) -> None:
+        # spread_bps > max  <=>  ask - bid > max / 20000 * (ask + bid): no per-token division.
+        # A threshold gate, not money: float is precise enough and far cheaper than Decimal.
+        self._max_spread_bps = Decimal(str(value))
+        self._spread_k = float(self._max_spread_bps) / 20000.0
+
     def stop(self) -> None:
         self._stop.set()
 
+    async def _interruptible_sleep(self, t: float) -> None:
+        # Returns early on stop() instead of holding shutdown for a full poll interval
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=t)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _wait_exchange_enabled(self, t: float) -> None:
+        # Wakes on enable or stop, whichever comes first; t bounds the wait
+        assert self._exchange_enabled is not None
+        waiters = [
+            asyncio.ensure_future(self._exchange_enabled.wait()),
+            asyncio.ensure_future(self._stop.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=t, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for w in waiters:
+                w.cancel()
+
     def _dbg(self, k: str) -> None:
-        if self._skip_stats:
-            self._skip_stats.inc(k)
+        self._pending_skips[k] += 1
+
+    def _flush_skips(self) -> None:
+        pending = self._pending_skips
+        if not pending:
+            return
+        if self._skip_stats is not None:
+            self._skip_stats.inc_many(pending)
+        pending.clear()
 
     def _poll_allowed(self, token_key: str) -> bool:
-        return time.time() >= self._poll_backoff_until.get(token_key, 0.0)
+        return time.monotonic() >= self._poll_backoff_until.get(token_key, 0.0)
 
     def _poll_backoff(self, token_key: str, sec: float) -> None:
-        self._poll_backoff_until[token_key] = time.time() + float(sec)
+        """
+        Exponential backoff with equal jitter: sec * 2**(n-1) capped at POLL_BACKOFF_CAP_SEC,
+        then a random delay in [delay/2, delay] so tokens failing together don't resync.
+        """
+        n = self._poll_fail_count.get(token_key, 0) + 1
+        self._poll_fail_count[token_key] = n
+        delay = min(POLL_BACKOFF_CAP_SEC, float(sec) * (1 << min(n - 1, 16)))
+        self._poll_backoff_until[token_key] = time.monotonic() + random.uniform(delay * 0.5, delay)
+
+    def _poll_success(self, token_key: str) -> None:
+        self._poll_backoff_until.pop(token_key, None)
+        self._poll_fail_count.pop(token_key, None)
 
     def _prune_poll_backoff(self) -> None:
         valid = set(self.token_cfgs)
         stale = [k for k in self._poll_backoff_until if k not in valid]
         for k in stale:
             del self._poll_backoff_until[k]
+        stale = [k for k in self._poll_fail_count if k not in valid]
+        for k in stale:
+            del self._poll_fail_count[k]
+        stale = [k for k in self._prepared if k not in valid]
+        for k in stale:
+            del self._prepared[k]
+
+    def _prepared_for(self, token_key: str, cfg: dict) -> tuple[dict, str, str, int, bool, bool]:
+        """
+        Parsed, config-invariant fields of a token. token_cfgs is rebuilt in place by
+        QuarantineManager with fresh cfg dicts, so the entry is keyed on cfg identity.
+        """
+        prep = self._prepared.get(token_key)
+        if prep is not None and prep[0] is cfg:
+            return prep
+        mint = str(cfg.get("mint", ""))
+        bybit_symbol = str(cfg.get("bybit_symbol", ""))
+        decimals = int(cfg.get("decimals", 0) or 0)
+        prep = (cfg, mint, bybit_symbol, decimals, self._is_pump_mint(mint), decimals <= 0 or decimals > 18)
+        self._prepared[token_key] = prep
+        return prep
 
     @staticmethod
     def _is_pump_mint(mint: str) -> bool:
-        try:
-            return str(mint).lower().endswith("pump")
-        except Exception:
-            return False
+        # Lowercase only the 4-char tail, not the whole ~44-char mint
+        return len(mint) >= 4 and mint[-4:].lower() == "pump"
 
-    async def _poll_one_token(self, token_key: str, cfg: dict) -> None:
-        try:
-            mint = str(cfg.get("mint", ""))
-            bybit_symbol = str(cfg.get("bybit_symbol", ""))
-            decimals = int(cfg.get("decimals", 0) or 0)
-
-            if self._is_pump_mint(mint):
-                self._dbg("poll_skip_pump_mint")
-                return
-            if self.denylist.is_denied(token_key, bybit_symbol):
-                self._dbg("poll_skip_denied")
-                return
-            if decimals <= 0 or decimals > 18:
-                self._dbg("poll_skip_bad_decimals")
-                return
+    def _adapt_concurrency(self, n: int, failed: int) -> None:
+        # AIMD backpressure: back off quickly during 429/5xx storms, recover gradually
+        if n >= POLL_ADAPT_MIN_BATCH and failed / n > POLL_ADAPT_FAIL_RATIO:
+            self._poll_cap = max(1, self._poll_cap // 2)
+        elif self._poll_cap < self.poll_concurrency:
+            self._poll_cap += 1
+        else:
+            self._poll_cap = self.poll_concurrency
 
-            ob = await self.state.get_orderbook(bybit_symbol)
+    def _ob_ok(self, token_key: str, bybit_symbol: str, now_ms: int | None = None) -> bool:
+        """CEX-side pre-filter: only tokens with a fresh, tight book are worth a Jupiter quote."""
+        try:
+            ob = self.state.get_orderbook(bybit_symbol)
             if ob is None or not ob.asks or not ob.bids:
                 self._dbg("poll_skip_no_ob")
-                return
-            if ob.age_ms() > self.max_ob_age_ms:
+                return False
+            if ob.age_ms(now_ms) > self.max_ob_age_ms:
                 self._dbg("poll_skip_ob_stale")
-                return
+                return False
 
-            bids, asks = snapshot_book(ob)
-            _mid, spread_bps = calc_mid_spread(bids, asks)
-            if spread_bps is None:
+            top = best_levels(ob)
+            if top is None:
                 self._dbg("poll_skip_no_spread")
-                return
-            if spread_bps > self.max_spread_bps:
+                return False
+            best_bid, best_ask = float(top[0][0]), float(top[1][0])
+            if best_bid <= 0 or best_ask <= 0:
+                self._dbg("poll_skip_no_spread")
+                return False
+            if best_ask - best_bid > self._spread_k * (best_bid + best_ask):
                 self._dbg("poll_skip_spread")
-                return
-
-            qp = await self.state.get_quote_pair(token_key)
-
-            stable_raw = to_raw(self.notional, self.stable_decimals)
-            buy_q = await self.jup.quote_exact_in(self.stable_mint, mint, stable_raw)
+                return False
+            return True
+        except Exception as e:
+            self._poll_backoff(token_key, self.backoff_on_err_sec)
+            self._dbg("poll_error")
+            log.exception("quote_poller error token=%s: %s", token_key, e)
+            return False
 
-            if buy_q is not None:
-                async with qp.lock:
-                    qp.buy_quote = buy_q
-                    qp.buy_updated_ms = self.state.now_ms()
-                self._poll_backoff_until.pop(token_key, None)
-            else:
+    def _store_quote(self, token_key: str, buy_q: JupQuote | None) -> None:
+        try:
+            if buy_q is None:
                 self._dbg("poll_buy_quote_none")
                 self._poll_backoff(token_key, self.backoff_on_none_sec)
-
+                return
+            qp = self.state.get_quote_pair(token_key)
+            qp.set_buy(buy_q, self.state.now_ms())
+            self._poll_success(token_key)
         except Exception as e:
             self._poll_backoff(token_key, self.backoff_on_err_sec)
             self._dbg("poll_error")
             log.exception("quote_poller error token=%s: %s", token_key, e)
 
     async def run(self) -> None:
-        sem = asyncio.Semaphore(max(1, int(self.poll_concurrency)))
-
-        async def runner(token_key: str, cfg: dict) -> None:
-            if not self._poll_allowed(token_key):
-                self._dbg("poll_skip_backoff")
-                return
-            async with sem:
-                await self._poll_one_token(token_key, cfg)
-
         while not self._stop.is_set():
             if self._exchange_enabled is not None and not self._exchange_enabled.is_set():
-                await asyncio.sleep(1)
+                await self._wait_exchange_enabled(1.0)
                 continue
             self._prune_poll_backoff()
-            started = time.time()
-            items = list(self.token_cfgs.items())
-            batch_size = max(1, int(self.poll_concurrency) * int(self._poll_batch_mult))
-
-            for i in range(0, len(items), batch_size):
-                chunk = items[i : i + batch_size]
-                tasks = [asyncio.create_task(runner(token_key, cfg)) for token_key, cfg in chunk]
-                await asyncio.gather(*tasks, return_exceptions=True)
-                await asyncio.sleep(0)
-
-            elapsed = time.time() - started
-            jitter = self.poll_interval * float(self.poll_jitter_ratio)
-            sleep_for = max(0.0, self.poll_interval - elapsed)
-            sleep_for += jitter * (time.time() % 1.0)
-            await asyncio.sleep(sleep_for)
+            started = time.monotonic()
+
+            batch: list[tuple[str, str]] = []
+            now_ms = self.state.now_ms()  # one clock read for every book age check of the cycle
+            # Snapshot: the loop awaits, and QuarantineManager may rebuild token_cfgs meanwhile
+            for token_key, cfg in cfg_items(self.token_cfgs):
+                if not self._poll_allowed(token_key):
+                    self._dbg("poll_skip_backoff")
+                    continue
+                _cfg, mint, bybit_symbol, _decimals, is_pump, bad_decimals = self._prepared_for(token_key, cfg)
+                if is_pump:
+                    self._dbg("poll_skip_pump_mint")
+                    continue
+                if self.denylist.is_denied(token_key, bybit_symbol):
+                    self._dbg("poll_skip_denied")
+                    continue
+                if bad_decimals:
+                    self._dbg("poll_skip_bad_decimals")
+                    continue
+                if not self._ob_ok(token_key, bybit_symbol, now_ms):
+                    continue
+                batch.append((token_key, mint))
+
+            if batch:
+                # One pipelined batch per cycle; each quote is stored (and stamped) as it arrives
+                stable_mint, stable_raw = self.stable_mint, self._stable_raw
+                failures_before = self.jup.retryable_failures
+                await self.jup.quote_exact_in_batch(
+                    [(stable_mint, mint, stable_raw) for _token_key, mint in batch],
+                    concurrency=self._poll_cap,
+                    on_result=lambda i, buy_q: self._store_quote(batch[i][0], buy_q),
+                )
+                self._adapt_concurrency(len(batch), self.jup.retryable_failures - failures_before)
+            self._flush_skips()
+
+            elapsed = time.monotonic() - started
+            base = max(0.0, self.poll_interval - elapsed)
+            j = base * self.poll_jitter_ratio
+            await self._interruptible_sleep(max(0.0, base + random.uniform(-j, j)))
@@ -1,26 +1,85 @@
 from __future__ import annotations
 
 import time
+from collections import defaultdict
+from collections.abc import Mapping
 
 
 class SkipStats:
     """
     Sliding-window counters for "why we skipped" instrumentation.
+
+    Counts live in a ring of one-second buckets: inc() bumps the current bucket,
+    snapshot() sums the last window_sec seconds. flush_if_due() hands out the
+    completed seconds since the previous flush, so consecutive flushes never
+    overlap. The ring holds two windows, so a flush can run up to window_sec late
+    without losing counts.
     """
 
     def __init__(self, window_sec: int = 30) -> None:
-        self.window_sec = int(window_sec)
-        self._counts: dict[str, int] = {}
-        self._last_flush = time.time()
+        self.window_sec = max(1, int(window_sec))
+        self._size = 2 * self.window_sec
+        self._buckets: list[defaultdict[str, int]] = [defaultdict(int) for _ in range(self._size)]
+        now = time.monotonic()
+        self._cursor_sec = int(now)  # second the newest bucket belongs to
+        self._flushed_sec = self._cursor_sec  # first second not yet handed out by flush_if_due
+        self._last_flush = now
+
+    def _advance(self, sec: int) -> None:
+        # Zero the buckets of seconds skipped since the cursor so the ring never mixes windows
+        cursor = self._cursor_sec
+        if sec <= cursor:
+            return
+        if sec - cursor >= self._size:
+            for b in self._buckets:
+                b.clear()
+        else:
+            for s in range(cursor + 1, sec + 1):
+                self._buckets[s % self._size].clear()
+        self._cursor_sec = sec
+        oldest = sec - self._size + 1
+        if self._flushed_sec < oldest:
+            self._flushed_sec = oldest
+
+    def _merge(self, start_sec: int, end_sec: int) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for s in range(max(start_sec, self._cursor_sec - self._size + 1), min(end_sec, self._cursor_sec + 1)):
+            for k, v in self._buckets[s % self._size].items():
+                out[k] = out.get(k, 0) + v
+        return out
 
     def inc(self, key: str, n: int = 1) -> None:
-        self._counts[key] = self._counts.get(key, 0) + n
+        sec = int(time.monotonic())
+        if sec != self._cursor_sec:
+            self._advance(sec)
+        self._buckets[sec % self._size][key] += n
+
+    def inc_many(self, counts: Mapping[str, int]) -> None:
+        """Add several counters at once: one clock read and bucket lookup for the whole batch."""
+        if not counts:
+            return
+        sec = int(time.monotonic())
+        if sec != self._cursor_sec:
+            self._advance(sec)
+        bucket = self._buckets[sec % self._size]
+        for k, n in counts.items():
+            bucket[k] += n
+
+    def snapshot(self, now: float | None = None) -> dict[str, int]:
+        """Counts over the last window_sec seconds, current second included."""
+        sec = int(time.monotonic() if now is None else now)
+        self._advance(sec)
+        return self._merge(sec - self.window_sec + 1, sec + 1)
 
-    def flush_if_due(self) -> dict[str, int] | None:
-        now = time.time()
+    def flush_if_due(self, now: float | None = None) -> dict[str, int] | None:
+        if now is None:
+            now = time.monotonic()
         if (now - self._last_flush) < self.window_sec:
             return None
         self._last_flush = now
-        data = self._counts
-        self._counts = {}
+        sec = int(now)
+        self._advance(sec)
+        # Only completed seconds: the current bucket is still filling and goes to the next flush
+        data = self._merge(self._flushed_sec, sec)
+        self._flushed_sec = max(self._flushed_sec, sec)
         return data
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Any
 
 ButtonRow = list[tuple[str, str]]
 Buttons = list[ButtonRow]
 
 
-@dataclass
+@dataclass(frozen=True)
 class Signal:
     key: str
     token: str
@@ -16,8 +17,75 @@ class Signal:
     notional_usd: Decimal
     text: str
     buttons: Buttons | None = None
+    # Telegram inline keyboard, built once in __post_init__
+    _reply_markup: dict | None = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.buttons:
+            rm = {"inline_keyboard": [[{"text": title, "url": url} for (title, url) in row] for row in self.buttons]}
+            object.__setattr__(self, "_reply_markup", rm)
 
     def to_reply_markup(self) -> dict | None:
-        if not self.buttons:
-            return None
-        return {"inline_keyboard": [[{"text": title, "url": url} for (title, url) in row] for row in self.buttons]}
+        return self._reply_markup
+
+
+class TokenCfgs(dict[str, dict[str, Any]]):
+    """
+    token_key -> cfg map shared by the engine, poller and QuarantineManager.
+
+    Every mutation bumps `version`, so per-loop readers can reuse items_snapshot()
+    instead of materializing list(items()) on each pass.
+    """
+
+    version = 0
+    _snapshot: tuple[int, list[tuple[str, dict[str, Any]]]] | None = None
+
+    def items_snapshot(self) -> list[tuple[str, dict[str, Any]]]:
+        """Cached list(items()); rebuilt only after a mutation. Treat as read-only."""
+        snap = self._snapshot
+        if snap is None or snap[0] != self.version:
+            snap = self._snapshot = (self.version, list(self.items()))
+        return snap[1]
+
+    def _bump(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key: str, value: dict[str, Any]) -> None:
+        super().__setitem__(key, value)
+        self._bump()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._bump()
+
+    def __ior__(self, other: Any) -> TokenCfgs:
+        super().__ior__(other)
+        self._bump()
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._bump()
+
+    def pop(self, *args: Any) -> Any:
+        self._bump()
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[str, dict[str, Any]]:
+        self._bump()
+        return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._bump()
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._bump()
+
+
+def cfg_items(token_cfgs: dict[str, dict[str, Any]]) -> list[tuple[str, dict[str, Any]]]:
+    """Per-loop token list: the cached snapshot for TokenCfgs, a fresh list for plain dicts."""
+    if isinstance(token_cfgs, TokenCfgs):
+        return token_cfgs.items_snapshot()
+    return list(token_cfgs.items())
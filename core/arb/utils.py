@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from decimal import ROUND_DOWN, Decimal
+from functools import lru_cache
 
 BYBIT_UI_BASE = "https://www.bybit.com/en/trade/spot"  # /BASE/QUOTE
 JUP_UI_BASE = "https://jup.ag/swap"
 
+# 10**decimals as Decimal; token decimals are small and repeat on every quote
+_SCALE_CACHE: dict[int, Decimal] = {i: Decimal(10) ** i for i in range(37)}
 
+
+def _scale(decimals: int) -> Decimal:
+    scale = _SCALE_CACHE.get(decimals)
+    if scale is None:
+        scale = _SCALE_CACHE[decimals] = Decimal(10) ** Decimal(decimals)
+    return scale
+
+
+# Symbol helpers are memoized: symbols come from static config, a small bounded set
+@lru_cache(maxsize=4096)
 def _base_from_bybit_symbol(bybit_symbol: str) -> str:
     """Extract base coin from Bybit symbol (e.g. BTCUSDT -> BTC)."""
     s = (bybit_symbol or "").upper().strip()
@@ -16,15 +29,16 @@ def _base_from_bybit_symbol(bybit_symbol: str) -> str:
 
 
 def to_raw(amount: Decimal, decimals: int) -> int:
-    scale = Decimal(10) ** Decimal(decimals)
-    return int((Decimal(amount) * scale).to_integral_value(rounding="ROUND_DOWN"))
+    if not isinstance(amount, Decimal):
+        amount = Decimal(amount)
+    return int((amount * _scale(decimals)).to_integral_value(rounding=ROUND_DOWN))
 
 
 def from_raw(raw: int, decimals: int) -> Decimal:
-    scale = Decimal(10) ** Decimal(decimals)
-    return Decimal(raw) / scale
+    return Decimal(raw) / _scale(decimals)
 
 
+@lru_cache(maxsize=4096)
 def bybit_spot_url(bybit_symbol: str) -> str:
     s = (bybit_symbol or "").upper().strip()
     quote = None
@@ -44,6 +58,7 @@ def jup_swap_url(input_mint: str, output_mint: str) -> str:
     return f"{JUP_UI_BASE}?inputMint={input_mint}&outputMint={output_mint}"
 
 
+@lru_cache(maxsize=4096)
 def jup_swap_url_by_symbol(bybit_symbol: str, buy: bool) -> str:
     """
     Jupiter's current UI uses path format: /swap/FROM-TO (e.g. /swap/BTC-USDC).
@@ -58,13 +73,23 @@ def jup_swap_url_by_symbol(bybit_symbol: str, buy: bool) -> str:
 
 def snapshot_book(ob) -> tuple[list[tuple[Decimal, Decimal]], list[tuple[Decimal, Decimal]]]:
     """
-    Atomic-ish snapshot: copy dicts first, then sort locally.
+    Sorted (bids, asks) of the book. Reuses OrderBook's per-version cache, so repeated
+    reads between updates don't re-sort; the returned lists are read-only.
     """
     try:
-        bids_map = ob.bids.copy()
-        asks_map = ob.asks.copy()
+        return ob.sorted_levels()
     except Exception:
         return [], []
-    bids = sorted(bids_map.items(), key=lambda x: x[0], reverse=True)
-    asks = sorted(asks_map.items(), key=lambda x: x[0])
-    return bids, asks
+
+
+def best_levels(ob) -> tuple[tuple[Decimal, Decimal], tuple[Decimal, Decimal]] | None:
+    """
+    Top of book ((best_bid_px, qty), (best_ask_px, qty)) in O(1) from the book's sorted
+    price index. Use instead of snapshot_book() when only mid/spread is needed.
+    """
+    bid_px = ob.best_bid()
+    ask_px = ob.best_ask()
+    if bid_px is None or ask_px is None:
+        return None
+    # No await between the reads, so the event loop cannot mutate the book underneath
+    return (bid_px, ob.bids[bid_px]), (ask_px, ob.asks[ask_px])
@@ -7,7 +7,6 @@ Used by auto-tuner to evaluate whether parameters need adjustment.
 from __future__ import annotations
 
 import logging
-import threading
 import time
 from collections import deque
 from dataclasses import dataclass
@@ -16,19 +15,33 @@ from typing import Any
 log = logging.getLogger("auto_tune.metrics")
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalEvent:
     """Record of a signal sent."""
 
     timestamp: float
 
 
-@dataclass
+# Aggregated skip counters, in the order of SkipEvent.counts
+SKIP_FIELDS = (
+    "skip_profit_le0",
+    "skip_persistence",
+    "skip_dedup",
+    "skip_spread",
+    "skip_depth",
+    "skip_cex_slip",
+)
+
+
+@dataclass(slots=True)
 class SkipEvent:
-    """Record of skip stats from engine drain."""
+    """Record of skip stats from engine drain, pre-aggregated into SKIP_FIELDS order.
+
+    Kept so the counts can be subtracted from the running totals when the event expires.
+    """
 
     timestamp: float
-    stats: dict[str, int]
+    counts: tuple[int, ...]
 
 
 class MetricsCollector:
@@ -38,6 +51,9 @@ class MetricsCollector:
     - record_signal(): call from on_signal callback
     - record_skips(stats_dict): call when engine.drain_debug_stats() returns data
     - get_window_stats(): returns aggregated stats for the window
+
+    Single-threaded: every caller (signal handler, status loop, auto-tune loop, API
+    handlers) runs on the event loop, so no lock is taken.
     """
 
     # Keys we aggregate from engine skip stats (A + B branches)
@@ -46,6 +62,23 @@ class MetricsCollector:
     SKIP_DEDUP_KEYS = ("A_skip_dedup", "B_skip_dedup")
     SKIP_DEPTH_KEYS = ("A_skip_depth", "B_skip_depth")
     SKIP_CEX_SLIP_KEYS = ("A_skip_cex_slip", "B_skip_cex_slip")
+    SKIP_SPREAD_KEYS = ("skip_spread", "poll_skip_spread")
+
+    # Engine skip key -> index into SkipEvent.counts
+    _SKIP_INDEX = {
+        k: i
+        for i, keys in enumerate(
+            (
+                SKIP_PROFIT_KEYS,
+                SKIP_PERSISTENCE_KEYS,
+                SKIP_DEDUP_KEYS,
+                SKIP_SPREAD_KEYS,
+                SKIP_DEPTH_KEYS,
+                SKIP_CEX_SLIP_KEYS,
+            )
+        )
+        for k in keys
+    }
 
     def __init__(self, window_sec: float = 30 * 60) -> None:
         """
@@ -55,14 +88,14 @@ class MetricsCollector:
         self._window_sec = float(window_sec)
         self._signals: deque[SignalEvent] = deque()
         self._skips: deque[SkipEvent] = deque()
-        self._lock = threading.Lock()
+        # Running sums of the counts in _skips: added on record, subtracted on expiry
+        self._totals: list[int] = [0] * len(SKIP_FIELDS)
 
     def record_signal(self) -> None:
         """Record that a signal was sent. Call from on_signal callback."""
-        with self._lock:
-            now = time.time()
-            self._signals.append(SignalEvent(timestamp=now))
-            self._prune(now)
+        now = time.monotonic()
+        self._signals.append(SignalEvent(timestamp=now))
+        self._prune(now)
 
     def record_skips(self, stats_dict: dict[str, int]) -> None:
         """
@@ -74,18 +107,30 @@ class MetricsCollector:
         """
         if not stats_dict:
             return
-        with self._lock:
-            now = time.time()
-            self._skips.append(SkipEvent(timestamp=now, stats=dict(stats_dict)))
-            self._prune(now)
+        # One pass over the drained keys; the window then only sums small tuples
+        counts = [0] * len(SKIP_FIELDS)
+        index = self._SKIP_INDEX
+        for k, v in stats_dict.items():
+            i = index.get(k)
+            if i is not None:
+                counts[i] += v
+        now = time.monotonic()
+        self._skips.append(SkipEvent(timestamp=now, counts=tuple(counts)))
+        totals = self._totals
+        for i, v in enumerate(counts):
+            totals[i] += v
+        self._prune(now)
 
     def _prune(self, now: float) -> None:
         """Remove events older than window."""
         cutoff = now - self._window_sec
         while self._signals and self._signals[0].timestamp < cutoff:
             self._signals.popleft()
-        while self._skips and self._skips[0].timestamp < cutoff:
-            self._skips.popleft()
+        skips = self._skips
+        totals = self._totals
+        while skips and skips[0].timestamp < cutoff:
+            for i, v in enumerate(skips.popleft().counts):
+                totals[i] -= v
 
     def get_window_stats(self) -> dict[str, Any]:
         """
@@ -103,40 +148,11 @@ class MetricsCollector:
             - window_sec: float
             - events_count: int (number of skip batches)
         """
-        with self._lock:
-            now = time.time()
-            self._prune(now)
-
-            signals_sent = len(self._signals)
-
-            skip_profit_le0 = 0
-            skip_persistence = 0
-            skip_dedup = 0
-            skip_spread = 0
-            skip_depth = 0
-            skip_cex_slip = 0
-
-            for ev in self._skips:
-                for k in self.SKIP_PROFIT_KEYS:
-                    skip_profit_le0 += ev.stats.get(k, 0)
-                for k in self.SKIP_PERSISTENCE_KEYS:
-                    skip_persistence += ev.stats.get(k, 0)
-                for k in self.SKIP_DEDUP_KEYS:
-                    skip_dedup += ev.stats.get(k, 0)
-                skip_spread += ev.stats.get("skip_spread", 0) + ev.stats.get("poll_skip_spread", 0)
-                for k in self.SKIP_DEPTH_KEYS:
-                    skip_depth += ev.stats.get(k, 0)
-                for k in self.SKIP_CEX_SLIP_KEYS:
-                    skip_cex_slip += ev.stats.get(k, 0)
-
-            return {
-                "signals_sent": signals_sent,
-                "skip_profit_le0": skip_profit_le0,
-                "skip_persistence": skip_persistence,
-                "skip_dedup": skip_dedup,
-                "skip_spread": skip_spread,
-                "skip_depth": skip_depth,
-                "skip_cex_slip": skip_cex_slip,
-                "window_sec": self._window_sec,
-                "events_count": len(self._skips),
-            }
+        now = time.monotonic()
+        self._prune(now)
+
+        out: dict[str, Any] = {"signals_sent": len(self._signals)}
+        out.update(zip(SKIP_FIELDS, self._totals))
+        out["window_sec"] = self._window_sec
+        out["events_count"] = len(self._skips)
+        return out
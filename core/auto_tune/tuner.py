@@ -19,7 +19,16 @@ if TYPE_CHECKING:
     from core.runtime_settings import RuntimeSettings
 
 
-@dataclass
+def _bounded_step(cur: float, delta: float, limit: float) -> float | None:
+    """
+    One step of cur + delta, clamped only at the limit it moves toward (lower limit for a
+    decrease, upper for an increase); None unless that moves cur in the direction of delta.
+    """
+    nv = max(limit, cur + delta) if delta < 0 else min(limit, cur + delta)
+    return nv if (nv - cur) * delta > 0 else None
+
+
+@dataclass(slots=True)
 class ParamChange:
     """A suggested parameter change."""
 
@@ -108,50 +117,50 @@ class AutoTuner:
         if events_count < 2:
             return changes
 
+        # Settings and config are read once into locals; the rules below only use these
+        cfg = self._config
+        current_min_profit = float(settings.min_profit_usd)
+        current_ph = int(settings.persistence_hits)
+        current_cd = int(settings.cooldown_sec)
+        current_spread = float(settings.max_spread_bps)
+
         # Bounds for min_profit_usd
         bp = bounds.min_profit_usd or {}
-        min_profit_min = float(bp.get("min", self._config.min_profit_usd_min))
-        min_profit_max = float(bp.get("max", self._config.min_profit_usd_max))
-
-        current_min_profit = float(settings.min_profit_usd)
+        min_profit_min = float(bp.get("min", cfg.min_profit_usd_min))
+        min_profit_max = float(bp.get("max", cfg.min_profit_usd_max))
 
         # Rule 1 (приоритет): мало сигналов + много skip_profit_le0 → понижаем min_profit
-        if signals_sent < self._config.target_signals_min and skip_profit_le0 > 0:
-            if current_min_profit > min_profit_min:
-                step = self._config.min_profit_step
-                new_val = max(min_profit_min, current_min_profit - step)
-                if new_val < current_min_profit:
-                    changes.append(
-                        ParamChange(
-                            param="min_profit_usd",
-                            old_value=current_min_profit,
-                            new_value=round(new_val, 2),
-                            reason=f"Мало сигналов ({signals_sent}), много skip_profit_le0 ({skip_profit_le0})",
-                        )
+        if signals_sent < cfg.target_signals_min and skip_profit_le0 > 0:
+            new_val = _bounded_step(current_min_profit, -cfg.min_profit_step, min_profit_min)
+            if new_val is not None:
+                changes.append(
+                    ParamChange(
+                        param="min_profit_usd",
+                        old_value=current_min_profit,
+                        new_value=round(new_val, 2),
+                        reason=f"Мало сигналов ({signals_sent}), много skip_profit_le0 ({skip_profit_le0})",
                     )
+                )
 
         # Rule 2: много сигналов → повышаем min_profit
-        if not changes and signals_sent > self._config.target_signals_max:
-            if current_min_profit < min_profit_max:
-                step = self._config.min_profit_step
-                new_val = min(min_profit_max, current_min_profit + step)
-                if new_val > current_min_profit:
-                    changes.append(
-                        ParamChange(
-                            param="min_profit_usd",
-                            old_value=current_min_profit,
-                            new_value=round(new_val, 2),
-                            reason=f"Много сигналов ({signals_sent})",
-                        )
+        if not changes and signals_sent > cfg.target_signals_max:
+            new_val = _bounded_step(current_min_profit, cfg.min_profit_step, min_profit_max)
+            if new_val is not None:
+                changes.append(
+                    ParamChange(
+                        param="min_profit_usd",
+                        old_value=current_min_profit,
+                        new_value=round(new_val, 2),
+                        reason=f"Много сигналов ({signals_sent})",
                     )
+                )
 
         # Rule 3: много skip_persistence → понижаем persistence_hits
         if not changes:
             ph_b = bounds.persistence_hits or {}
-            ph_min = int(ph_b.get("min", self._config.persistence_hits_min))
-            current_ph = int(settings.persistence_hits)
-            if skip_persistence > 20 and current_ph > ph_min:
-                new_ph = max(ph_min, current_ph - 1)
+            ph_min = int(ph_b.get("min", cfg.persistence_hits_min))
+            new_ph = _bounded_step(current_ph, -1, ph_min) if skip_persistence > 20 else None
+            if new_ph is not None:
                 changes.append(
                     ParamChange(
                         param="persistence_hits",
@@ -164,36 +173,32 @@ class AutoTuner:
         # Rule 4: много skip_dedup → повышаем cooldown
         if not changes:
             cd_b = bounds.cooldown_sec or {}
-            cd_max = int(cd_b.get("max", self._config.cooldown_sec_max))
-            current_cd = int(settings.cooldown_sec)
-            if skip_dedup > 30 and current_cd < cd_max:
-                new_cd = min(cd_max, current_cd + 5)
-                if new_cd > current_cd:
-                    changes.append(
-                        ParamChange(
-                            param="cooldown_sec",
-                            old_value=current_cd,
-                            new_value=new_cd,
-                            reason=f"Много skip_dedup ({skip_dedup})",
-                        )
+            cd_max = int(cd_b.get("max", cfg.cooldown_sec_max))
+            new_cd = _bounded_step(current_cd, 5, cd_max) if skip_dedup > 30 else None
+            if new_cd is not None:
+                changes.append(
+                    ParamChange(
+                        param="cooldown_sec",
+                        old_value=current_cd,
+                        new_value=new_cd,
+                        reason=f"Много skip_dedup ({skip_dedup})",
                     )
+                )
 
         # Rule 5: много skip_spread → повышаем max_spread_bps
         if not changes:
             sp_b = bounds.max_spread_bps or {}
-            spread_max = float(sp_b.get("max", self._config.max_spread_bps_max))
-            current_spread = float(settings.max_spread_bps)
-            if skip_spread > 50 and current_spread < spread_max:
-                new_spread = min(spread_max, current_spread + 10)
-                if new_spread > current_spread:
-                    changes.append(
-                        ParamChange(
-                            param="max_spread_bps",
-                            old_value=current_spread,
-                            new_value=round(new_spread, 1),
-                            reason=f"Много skip_spread ({skip_spread})",
-                        )
+            spread_max = float(sp_b.get("max", cfg.max_spread_bps_max))
+            new_spread = _bounded_step(current_spread, 10, spread_max) if skip_spread > 50 else None
+            if new_spread is not None:
+                changes.append(
+                    ParamChange(
+                        param="max_spread_bps",
+                        old_value=current_spread,
+                        new_value=round(new_spread, 1),
+                        reason=f"Много skip_spread ({skip_spread})",
                     )
+                )
 
         # Применяем только одно изменение за цикл — избегаем осцилляции
         return changes[:1]
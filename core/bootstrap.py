@@ -15,6 +15,9 @@ from core.config import AppConfig
 
 log = __import__("logging").getLogger("bootstrap")
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_config(cfg_path: str) -> tuple[AppConfig, dict[str, Any], Path]:
     """
@@ -25,7 +28,7 @@ def load_config(cfg_path: str) -> tuple[AppConfig, dict[str, Any], Path]:
     cfg_dir = Path(os.path.dirname(cfg_path))
 
     with open(cfg_path, encoding="utf-8") as f:
-        raw = yaml.safe_load(f)
+        raw = yaml.load(f, Loader=_YAML_LOADER)
 
     cfg = AppConfig.model_validate(raw)
     return cfg, raw or {}, cfg_dir
@@ -2,43 +2,35 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+# Built once: Decimal construction from a literal costs more than the arithmetic it feeds
+_ZERO = Decimal("0")
 
-def calc_mid_spread(
-    bids: list[tuple[Decimal, Decimal]],
-    asks: list[tuple[Decimal, Decimal]],
-) -> tuple[Decimal | None, Decimal | None]:
-    if not bids or not asks:
-        return None, None
-    best_bid = bids[0][0]
-    best_ask = asks[0][0]
-    if best_bid <= 0 or best_ask <= 0:
-        return None, None
-    mid = (best_bid + best_ask) / Decimal("2")
-    if mid <= 0:
-        return None, None
-    spread_bps = (best_ask - best_bid) / mid * Decimal("10000")
-    return mid, spread_bps
-
-
-def coverage_pct(got: Decimal, target: Decimal) -> Decimal:
+
+def _dec(x: Decimal | float | int) -> Decimal:
+    return x if isinstance(x, Decimal) else Decimal(x)
+
+
+def coverage_pct(got: Decimal | float, target: Decimal | float) -> Decimal | float:
+    # Works on Decimal or float operands alike; the engine gates on floats
     if target <= 0:
-        return Decimal("0")
-    return (Decimal(got) / Decimal(target)) * Decimal("100")
+        return _ZERO if isinstance(target, Decimal) else 0.0
+    return got / target * 100
 
 
 def net_profit(stable_out: Decimal, notional: Decimal, required: Decimal) -> Decimal:
-    return Decimal(stable_out) - Decimal(notional) - Decimal(required)
+    # Callers pass Decimals already: no copy construction per call
+    return _dec(stable_out) - _dec(notional) - _dec(required)
 
 
-def price_ratio_ok(implied: Decimal, mid: Decimal, max_ratio: Decimal) -> bool:
+def price_ratio_ok(implied: Decimal | float, mid: Decimal | float, max_ratio: Decimal | float) -> bool:
     if implied <= 0 or mid <= 0:
         return False
-    ratio = max(Decimal(implied), Decimal(mid)) / min(Decimal(implied), Decimal(mid))
-    return ratio <= Decimal(max_ratio)
+    ratio = max(implied, mid) / min(implied, mid)
+    return ratio <= max_ratio
 
 
-def gross_cap_ok(stable_out: Decimal, notional: Decimal, max_gross_profit_pct: Decimal) -> bool:
+def gross_cap_ok(stable_out: Decimal | float, notional: Decimal | float, max_gross_profit_pct: Decimal | float) -> bool:
     if notional <= 0:
         return False
-    gross_pct = (Decimal(stable_out) - Decimal(notional)) / Decimal(notional) * Decimal("100")
-    return gross_pct <= Decimal(max_gross_profit_pct)
+    gross_pct = (stable_out - notional) / notional * 100
+    return gross_pct <= max_gross_profit_pct
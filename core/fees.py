@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from decimal import Decimal
 
+_BPS = Decimal("10000")
+
 
 @dataclass
 class Thresholds:
@@ -20,6 +22,6 @@ class Thresholds:
         return self.min_profit_usd
 
     def required_profit_usd(self, notional_usd: Decimal) -> Decimal:
-        cex_fee = notional_usd * (self.bybit_taker_fee_bps / Decimal("10000"))
-        buffers = notional_usd * ((self.latency_buffer_bps + self.usdt_usdc_buffer_bps) / Decimal("10000"))
+        cex_fee = notional_usd * (self.bybit_taker_fee_bps / _BPS)
+        buffers = notional_usd * ((self.latency_buffer_bps + self.usdt_usdc_buffer_bps) / _BPS)
         return cex_fee + buffers + self.solana_tx_fee_usd + self.min_profit_usd
@@ -26,16 +26,18 @@ def make_on_jup_skip(
 
     jup_bad_counts: dict[str, int] = {}
     jup_bad_last_ts: dict[str, float] = {}
-    jup_qrate: dict = {"ts": 0.0, "cnt": 0}
+    # Quarantine rate window: start of the current minute and quarantines issued in it
+    qrate_ts = 0.0
+    qrate_cnt = 0
 
-    def allow_jup_quarantine() -> bool:
-        now2 = time.time()
-        if (now2 - jup_qrate["ts"]) > 60:
-            jup_qrate["ts"] = now2
-            jup_qrate["cnt"] = 0
-        if jup_qrate["cnt"] >= JUP_MAX_QUARANTINES_PER_MIN:
+    def allow_jup_quarantine(now: float) -> bool:
+        nonlocal qrate_ts, qrate_cnt
+        if (now - qrate_ts) > 60:
+            qrate_ts = now
+            qrate_cnt = 0
+        if qrate_cnt >= JUP_MAX_QUARANTINES_PER_MIN:
             return False
-        jup_qrate["cnt"] += 1
+        qrate_cnt += 1
         return True
 
     async def on_jup_skip(code: str, input_mint: str, output_mint: str, bad_mint: str, msg: str) -> None:
@@ -53,21 +55,21 @@ def make_on_jup_skip(
         if not symbol:
             return
 
-        now = time.time()
-        last = jup_bad_last_ts.get(m, 0.0)
-        if (now - last) > JUP_BAD_WINDOW_SEC:
+        now = time.monotonic()
+        last = jup_bad_last_ts.get(m)
+        if last is None or (now - last) > JUP_BAD_WINDOW_SEC:
             jup_bad_counts[m] = 0
         jup_bad_last_ts[m] = now
         jup_bad_counts[m] = jup_bad_counts.get(m, 0) + 1
 
         if code == "TOKEN_NOT_TRADABLE" and jup_bad_counts[m] >= JUP_NOT_TRADABLE_HITS:
-            if not allow_jup_quarantine():
+            if not allow_jup_quarantine(now):
                 return
             await quarantine_add(symbol, "JUP_TOKEN_NOT_TRADABLE", JUP_NOT_TRADABLE_TTL_SEC)
             return
 
         if code == "COULD_NOT_FIND_ANY_ROUTE" and jup_bad_counts[m] >= JUP_NO_ROUTE_HITS:
-            if not allow_jup_quarantine():
+            if not allow_jup_quarantine(now):
                 return
             await quarantine_add(symbol, "JUP_NO_ROUTE", JUP_NO_ROUTE_TTL_SEC)
             return
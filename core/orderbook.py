@@ -2,12 +2,20 @@ from __future__ import annotations
 
 import logging
 import time
+from array import array
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 
 log = logging.getLogger(__name__)
 
 
+# Distinct price strings seen across all books; levels are re-quoted at the same prices
+# over and over, so parsed prices are shared instead of rebuilt per WS row
+PRICE_CACHE_SIZE = 65536
+
+
 def _safe_decimal(s: str) -> Decimal | None:
     """Parse string to Decimal; return None on invalid input."""
     try:
@@ -16,7 +24,21 @@ def _safe_decimal(s: str) -> Decimal | None:
         return None
 
 
-@dataclass
+# Raising variant for the well-formed-row fast paths; lru_cache does not cache exceptions
+_price_decimal = lru_cache(maxsize=PRICE_CACHE_SIZE)(Decimal)
+
+_PARSE_ERRORS = (InvalidOperation, TypeError, ValueError)
+
+
+def _parse_price(s: str) -> Decimal | None:
+    """_safe_decimal() memoized per price string (Decimals are immutable, so sharing is safe)."""
+    try:
+        return _price_decimal(s)
+    except _PARSE_ERRORS:
+        return None
+
+
+@dataclass(slots=True)
 class OrderBook:
     symbol: str
     bids: dict[Decimal, Decimal] = field(default_factory=dict)  # price -> qty
@@ -24,16 +46,50 @@ class OrderBook:
     last_update_ms: int = 0
     last_cts_ms: int = 0
     last_snapshot_ms: int = 0
+    # Bumped on every snapshot/delta; keys the sorted-levels cache below
+    version: int = 0
+    _sorted_cache: tuple[int, list[tuple[Decimal, Decimal]], list[tuple[Decimal, Decimal]]] | None = field(
+        default=None, repr=False, compare=False
+    )
+    _soa_cache: tuple[int, tuple[array, array, array, array]] | None = field(default=None, repr=False, compare=False)
+    # Prices of bids/asks kept sorted ascending as levels come and go (O(log N) bisect per
+    # delta row), so sorted views are an O(N) walk instead of a full re-sort
+    _bid_keys: list[Decimal] = field(default_factory=list, repr=False, compare=False)
+    _ask_keys: list[Decimal] = field(default_factory=list, repr=False, compare=False)
+
+    @staticmethod
+    def _set_level(book: dict[Decimal, Decimal], keys: list[Decimal], price: Decimal, qty: Decimal) -> None:
+        if qty == 0:
+            if book.pop(price, None) is not None:
+                del keys[bisect_left(keys, price)]
+        else:
+            if price not in book:
+                insort(keys, price)
+            book[price] = qty
 
     def apply_snapshot(self, bids: list[list[str]], asks: list[list[str]], ts_ms: int, cts_ms: int) -> None:
         def _parse_side(rows: list[list[str]]) -> dict[Decimal, Decimal]:
-            result: dict[Decimal, Decimal] = {}
+            # Fast path: Bybit rows are [price, size] strings, so parse without per-row checks.
+            # Any malformed row aborts it and the side is re-parsed below with warnings.
+            if not rows:
+                return {}
+            try:
+                result = {}
+                for p, q in rows:
+                    qty = Decimal(q)
+                    if qty > 0:
+                        result[_price_decimal(p)] = qty
+                return result
+            except _PARSE_ERRORS:
+                pass
+
+            result = {}
             for row in rows:
                 if len(row) < 2:
                     log.warning("orderbook %s: skip malformed snapshot row (len<2) row=%r", self.symbol, row)
                     continue
                 p, q = row[0], row[1]
-                price, qty = _safe_decimal(p), _safe_decimal(q)
+                price, qty = _parse_price(p), _safe_decimal(q)
                 if price is not None and qty is not None and qty > 0:
                     result[price] = qty
                 elif price is None or qty is None:
@@ -42,50 +98,104 @@ class OrderBook:
 
         self.bids = _parse_side(bids or [])
         self.asks = _parse_side(asks or [])
+        self._bid_keys = sorted(self.bids)
+        self._ask_keys = sorted(self.asks)
         self.last_update_ms = ts_ms
         self.last_cts_ms = cts_ms
         self.last_snapshot_ms = cts_ms or ts_ms
+        self.version += 1
 
-    def apply_delta(self, bids: list[list[str]], asks: list[list[str]], ts_ms: int, cts_ms: int) -> None:
-        for row in bids or []:
-            if len(row) < 2:
-                log.warning("orderbook %s: skip malformed delta bid row (len<2) row=%r", self.symbol, row)
-                continue
-            p, q = row[0], row[1]
-            price, qty = _safe_decimal(p), _safe_decimal(q)
-            if price is None or qty is None:
-                log.warning("orderbook %s: skip malformed delta bid p=%r q=%r", self.symbol, p, q)
-                continue
-            if qty == 0:
-                self.bids.pop(price, None)
-            else:
-                self.bids[price] = qty
+    def _apply_delta_side(self, book: dict[Decimal, Decimal], keys: list[Decimal], rows, side: str) -> None:
+        # Fast path for well-formed [price, size] rows. On a malformed row the whole side is
+        # replayed defensively: every row is an idempotent set/remove, so replaying is safe.
+        try:
+            for p, q in rows:
+                price = _price_decimal(p)
+                qty = Decimal(q)
+                if qty == 0:
+                    if book.pop(price, None) is not None:
+                        del keys[bisect_left(keys, price)]
+                else:
+                    if price not in book:
+                        insort(keys, price)
+                    book[price] = qty
+            return
+        except _PARSE_ERRORS:
+            pass
 
-        for row in asks or []:
+        for row in rows:
             if len(row) < 2:
-                log.warning("orderbook %s: skip malformed delta ask row (len<2) row=%r", self.symbol, row)
+                log.warning("orderbook %s: skip malformed delta %s row (len<2) row=%r", self.symbol, side, row)
                 continue
             p, q = row[0], row[1]
-            price, qty = _safe_decimal(p), _safe_decimal(q)
+            price, qty = _parse_price(p), _safe_decimal(q)
             if price is None or qty is None:
-                log.warning("orderbook %s: skip malformed delta ask p=%r q=%r", self.symbol, p, q)
+                log.warning("orderbook %s: skip malformed delta %s p=%r q=%r", self.symbol, side, p, q)
                 continue
-            if qty == 0:
-                self.asks.pop(price, None)
-            else:
-                self.asks[price] = qty
+            self._set_level(book, keys, price, qty)
+
+    def apply_delta(self, bids: list[list[str]], asks: list[list[str]], ts_ms: int, cts_ms: int) -> None:
+        if bids:
+            self._apply_delta_side(self.bids, self._bid_keys, bids, "bid")
+        if asks:
+            self._apply_delta_side(self.asks, self._ask_keys, asks, "ask")
 
         self.last_update_ms = ts_ms
         self.last_cts_ms = cts_ms
+        self.version += 1
+
+    def sorted_levels(self) -> tuple[list[tuple[Decimal, Decimal]], list[tuple[Decimal, Decimal]]]:
+        """
+        (bids best-first, asks best-first), sorted at most once per book version.
+        The lists are shared between callers and must be treated as read-only.
+        """
+        cache = self._sorted_cache
+        if cache is not None and cache[0] == self.version:
+            return cache[1], cache[2]
+        bids = self.bids_sorted()
+        asks = self.asks_sorted()
+        self._sorted_cache = (self.version, bids, asks)
+        return bids, asks
+
+    def float_levels(self) -> tuple[array, array, array, array]:
+        """
+        Sorted levels as parallel float64 arrays (bids_px, bids_qty, asks_px, asks_qty),
+        best first; built at most once per book version. Read-only, like sorted_levels().
+        """
+        cache = self._soa_cache
+        if cache is not None and cache[0] == self.version:
+            return cache[1]
+        # Columns come straight from the price index: no intermediate (price, qty) tuples
+        bid_keys = self._bid_keys[::-1]
+        ask_keys = self._ask_keys
+        soa = (
+            array("d", map(float, bid_keys)),
+            array("d", map(float, map(self.bids.__getitem__, bid_keys))),
+            array("d", map(float, ask_keys)),
+            array("d", map(float, map(self.asks.__getitem__, ask_keys))),
+        )
+        self._soa_cache = (self.version, soa)
+        return soa
 
     def bids_sorted(self) -> list[tuple[Decimal, Decimal]]:
-        return sorted(self.bids.items(), key=lambda x: x[0], reverse=True)
+        bids = self.bids
+        return [(p, bids[p]) for p in reversed(self._bid_keys)]
 
     def asks_sorted(self) -> list[tuple[Decimal, Decimal]]:
-        return sorted(self.asks.items(), key=lambda x: x[0])
+        asks = self.asks
+        return [(p, asks[p]) for p in self._ask_keys]
+
+    def best_bid(self) -> Decimal | None:
+        keys = self._bid_keys
+        return keys[-1] if keys else None
+
+    def best_ask(self) -> Decimal | None:
+        keys = self._ask_keys
+        return keys[0] if keys else None
 
-    def age_ms(self) -> int:
-        now = int(time.time() * 1000)
+    def age_ms(self, now_ms: int | None = None) -> int:
+        """Milliseconds since the last update; pass now_ms to reuse a clock read across calls."""
+        now = time.time_ns() // 1_000_000 if now_ms is None else now_ms
         # если у тебя хранится last_ts_ms / last_cts_ms — используй то, что реально обновляется
         last = int(self.last_cts_ms or self.last_update_ms or 0)
         if last <= 0:
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass
+from typing import NamedTuple
 
 import yaml
 
+# libyaml-backed loader/dumper when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
-@dataclass
-class QuarantineEntry:
+
+class QuarantineEntry(NamedTuple):
     reason: str
     until_ts: int  # unix seconds
 
@@ -24,7 +27,7 @@ def load_quarantine(path: str) -> dict[str, QuarantineEntry]:
     """
     try:
         with open(path, encoding="utf-8") as f:
-            raw = yaml.safe_load(f) or {}
+            raw = yaml.load(f, Loader=_YAML_LOADER) or {}
     except FileNotFoundError:
         return {}
     except Exception:
@@ -53,15 +56,15 @@ def save_quarantine(path: str, q: dict[str, QuarantineEntry]) -> None:
     payload = {
         "version": 1,
         "updated_at_ts": now_ts(),
-        "symbols": {k: {"reason": v.reason, "until": int(v.until_ts)} for k, v in sorted(q.items())},
+        "symbols": {k: {"reason": reason, "until": int(until_ts)} for k, (reason, until_ts) in sorted(q.items())},
     }
     with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(payload, f, sort_keys=False, allow_unicode=True)
+        yaml.dump(payload, f, Dumper=_YAML_DUMPER, sort_keys=False, allow_unicode=True)
 
 
 def prune_expired(q: dict[str, QuarantineEntry], ts: int | None = None) -> dict[str, QuarantineEntry]:
     ts = now_ts() if ts is None else int(ts)
-    return {sym: ent for sym, ent in q.items() if int(ent.until_ts) > ts}
+    return {sym: ent for sym, ent in q.items() if ent.until_ts > ts}
 
 
 def is_quarantined(q: dict[str, QuarantineEntry], symbol: str, ts: int | None = None) -> tuple[bool, str]:
@@ -69,6 +72,6 @@ def is_quarantined(q: dict[str, QuarantineEntry], symbol: str, ts: int | None =
     ent = q.get(symbol)
     if not ent:
         return False, ""
-    if int(ent.until_ts) <= ts:
+    if ent.until_ts <= ts:
         return False, ""
     return True, ent.reason
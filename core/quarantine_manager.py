@@ -7,7 +7,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from collections.abc import Callable
+from bisect import insort
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import Any
 
@@ -37,19 +38,89 @@ class QuarantineManager:
         self.full_tokens = full_tokens
         self.base_denylist = base_denylist
         self.token_cfgs = token_cfgs
+        # bybit_symbol -> token keys, so quarantining one symbol touches only its own tokens
+        self._tokens_by_symbol: dict[str, list[str]] = {}
+        # bybit_symbol -> (mint, decimals) over all configured tokens, quarantined ones included (for the verifier)
+        self.symbol_to_info: dict[str, tuple[str, int]] = {}
+        for token_key, t in full_tokens.items():
+            sym = getattr(t, "bybit_symbol", "") or ""
+            self._tokens_by_symbol.setdefault(sym, []).append(token_key)
+            mint = getattr(t, "mint", None)
+            decimals = getattr(t, "decimals", None)
+            if sym and mint and decimals is not None:
+                self.symbol_to_info[sym] = (str(mint), int(decimals))
 
         self.quarantined_set: set[str] = set()
+        # base denylist | quarantined; cfg.filters.denylist_symbols mirrors it as a sorted list
+        self.denylist_set: set[str] = set()
+        self._denylist_list: list[str] | None = None
         self._lock = asyncio.Lock()
         self._file_lock = asyncio.Lock()  # protects file I/O from add vs sync_loop race
         self._last_write: dict[str, int] = {}
+        # ((st_mtime_ns, st_size), parsed file) of the last load/save, so an unchanged file is not re-parsed
+        self._cached: tuple[tuple[int, int], dict[str, QuarantineEntry]] | None = None
+
+    def _file_key(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.quarantine_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self) -> dict[str, QuarantineEntry]:
+        """load_quarantine() with the parse skipped while the file is unchanged. Returns a fresh dict."""
+        key = self._file_key()
+        if key is None:
+            self._cached = None
+            return {}
+        cached = self._cached
+        if cached is None or cached[0] != key:
+            cached = self._cached = (key, load_quarantine(str(self.quarantine_path)))
+        return dict(cached[1])
+
+    def _save(self, q: dict[str, QuarantineEntry]) -> None:
+        save_quarantine(str(self.quarantine_path), q)
+        key = self._file_key()
+        self._cached = (key, dict(q)) if key is not None else None
+
+    # Async variants for the runtime paths: YAML parse/dump runs in a thread so it can't stall the event loop.
+    # Callers hold _file_lock, which also serializes access to _cached.
+
+    async def _aload(self) -> dict[str, QuarantineEntry]:
+        key = self._file_key()
+        if key is None:
+            self._cached = None
+            return {}
+        cached = self._cached
+        if cached is None or cached[0] != key:
+            parsed = await asyncio.to_thread(load_quarantine, str(self.quarantine_path))
+            cached = self._cached = (key, parsed)
+        return dict(cached[1])
+
+    async def _asave(self, q: dict[str, QuarantineEntry]) -> None:
+        await asyncio.to_thread(save_quarantine, str(self.quarantine_path), q)
+        key = self._file_key()
+        self._cached = (key, dict(q)) if key is not None else None
 
     def _rebuild_denylist_inplace(self) -> None:
-        merged = sorted(set(self.base_denylist) | self.quarantined_set)
-        if self.cfg.filters.denylist_symbols is None:
-            self.cfg.filters.denylist_symbols = merged
-        else:
-            self.cfg.filters.denylist_symbols.clear()
-            self.cfg.filters.denylist_symbols.extend(merged)
+        merged = set(self.base_denylist) | self.quarantined_set
+        current = self.cfg.filters.denylist_symbols
+        if current is None or current is not self._denylist_list:
+            # first build (or the cfg list was replaced): sort once, then maintain incrementally
+            if current is None:
+                current = self.cfg.filters.denylist_symbols = []
+            current[:] = sorted(merged)
+            self._denylist_list = current
+            self.denylist_set = merged
+            return
+
+        added = merged - self.denylist_set
+        removed = self.denylist_set - merged
+        if removed:
+            current[:] = [s for s in current if s not in removed]
+        for sym in added:
+            insort(current, sym)
+        self.denylist_set = merged
 
     def _apply_quarantine_to_cfg(self) -> None:
         self.cfg.bybit.symbols = [s for s in self.full_symbols if s not in self.quarantined_set]
@@ -58,6 +129,26 @@ class QuarantineManager:
         }
         self._rebuild_denylist_inplace()
 
+    def _quarantine_inplace(self, symbols: Iterable[str]) -> None:
+        """
+        Delta form of _apply_quarantine_to_cfg + _rebuild_token_cfgs_inplace for newly quarantined
+        symbols (already in quarantined_set): drops just their entries instead of rebuilding everything.
+        """
+        active = self.cfg.bybit.symbols
+        tokens = self.cfg.trading.tokens
+        deny = self._denylist_list
+        for sym in symbols:
+            try:
+                active.remove(sym)
+            except ValueError:
+                pass
+            for token_key in self._tokens_by_symbol.get(sym, ()):
+                if tokens.pop(token_key, None) is not None:
+                    self.token_cfgs.pop(token_key, None)
+            if deny is not None and sym not in self.denylist_set:
+                self.denylist_set.add(sym)
+                insort(deny, sym)
+
     def _rebuild_token_cfgs_inplace(self) -> None:
         self.token_cfgs.clear()
         for token_key, t in self.cfg.trading.tokens.items():
@@ -65,7 +156,8 @@ class QuarantineManager:
 
     def load_initial(self) -> None:
         """Load quarantine, validate BAD_TOKEN_CFG, apply to config."""
-        q0 = prune_expired(load_quarantine(str(self.quarantine_path)))
+        now = now_ts()
+        q0 = prune_expired(self._load(), ts=now)
 
         bad_added = False
         for token_key, t in list(self.full_tokens.items()):
@@ -77,7 +169,7 @@ class QuarantineManager:
             if not ok:
                 sym = getattr(t, "bybit_symbol", "") or ""
                 if sym and sym not in q0:
-                    q0[sym] = QuarantineEntry(reason="BAD_TOKEN_CFG", until_ts=now_ts() + 24 * 3600)
+                    q0[sym] = QuarantineEntry(reason="BAD_TOKEN_CFG", until_ts=now + 24 * 3600)
                     bad_added = True
                     log.warning(
                         "BAD_TOKEN_CFG: token_key=%s sym=%s mint=%s decimals=%s",
@@ -88,7 +180,7 @@ class QuarantineManager:
                     )
 
         if bad_added:
-            save_quarantine(str(self.quarantine_path), q0)
+            self._save(q0)
 
         self.quarantined_set = set(q0.keys())
         self._apply_quarantine_to_cfg()
@@ -115,30 +207,30 @@ class QuarantineManager:
 
             until = now + int(ttl_sec)
 
-            q = prune_expired(load_quarantine(str(self.quarantine_path)))
+            q = prune_expired(await self._aload(), ts=now)
             prev = q.get(symbol)
 
             if prev is not None and prev.until_ts > (now + 1800):
                 async with self._lock:
                     self.quarantined_set.add(symbol)
-                    self._apply_quarantine_to_cfg()
-                    self._rebuild_token_cfgs_inplace()
+                    self._quarantine_inplace((symbol,))
                 return
 
             q[symbol] = QuarantineEntry(reason=reason, until_ts=until)
-            save_quarantine(str(self.quarantine_path), q)
+            await self._asave(q)
 
         async with self._lock:
             self.quarantined_set.add(symbol)
-            self._apply_quarantine_to_cfg()
-            self._rebuild_token_cfgs_inplace()
+            self._quarantine_inplace((symbol,))
 
         log.warning("AUTO-QUARANTINE: %s reason=%s ttl=%ds file=%s", symbol, reason, ttl_sec, self.quarantine_path)
 
-    async def contains(self, symbol: str) -> bool:
-        """Check if symbol is quarantined. Thread-safe."""
-        async with self._lock:
-            return symbol in self.quarantined_set
+    def contains(self, symbol: str) -> bool:
+        """
+        Check if symbol is quarantined. Lock-free: a single set lookup, which can't observe a
+        half-applied update (sync_loop rebinds quarantined_set, add() does one set.add).
+        """
+        return symbol in self.quarantined_set
 
     async def remove_recovered(
         self,
@@ -149,12 +241,13 @@ class QuarantineManager:
         if not symbols:
             return
         sym_set = set(symbols)
+        now = now_ts()
 
         async with self._file_lock:
-            q = prune_expired(load_quarantine(str(self.quarantine_path)))
+            q = prune_expired(await self._aload(), ts=now)
             for sym in sym_set:
                 q.pop(sym, None)
-            save_quarantine(str(self.quarantine_path), q)
+            await self._asave(q)
 
         async with self._lock:
             self.quarantined_set -= sym_set
@@ -183,27 +276,31 @@ class QuarantineManager:
             last_mtime = max(last_mtime, mtime)
 
             if changed:
+                now = now_ts()
                 try:
                     async with self._file_lock:
-                        q = load_quarantine(str(self.quarantine_path))
-                        q2 = prune_expired(q)
-                        if q2.keys() != q.keys():
-                            save_quarantine(str(self.quarantine_path), q2)
-                        new_set = set(q2.keys())
+                        q = await self._aload()
+                        q2 = prune_expired(q, ts=now)
+                        if len(q2) != len(q):  # q2 is a subset of q
+                            await self._asave(q2)
+                        new_set = set(q2)
                 except Exception:
                     log.exception("Failed to sync quarantine file=%s", self.quarantine_path)
                     new_set = set()
 
                 async with self._lock:
-                    before = set(self.quarantined_set)
-                    added = new_set - before
-                    removed = before - new_set
-
-                    if added or removed:
-                        self.quarantined_set.clear()
-                        self.quarantined_set.update(new_set)
-                        self._apply_quarantine_to_cfg()
-                        self._rebuild_token_cfgs_inplace()
+                    before = self.quarantined_set
+                    if new_set != before:
+                        diff = new_set ^ before
+                        added = diff & new_set
+                        removed = diff & before
+                        self.quarantined_set = new_set
+                        if removed:
+                            # recovered symbols must be re-inserted in config order: full rebuild
+                            self._apply_quarantine_to_cfg()
+                            self._rebuild_token_cfgs_inplace()
+                        else:
+                            self._quarantine_inplace(added)
 
                         if on_symbols_changed:
                             result = on_symbols_changed()
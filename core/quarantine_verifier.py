@@ -11,7 +11,7 @@ import logging
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
-from core.quarantine import load_quarantine, prune_expired
+from core.quarantine import load_quarantine, now_ts, prune_expired
 
 from core.arb.utils import to_raw
 
@@ -23,13 +23,12 @@ if TYPE_CHECKING:
 
 VERIFY_INTERVAL_SEC = 30 * 60  # 30 min
 MAX_JUP_CHECKS_PER_RUN = 15  # limit Jupiter API calls per run
-JUP_CHECK_DELAY_SEC = 2.0  # delay between Jupiter checks
+JUP_CHECK_CONCURRENCY = 4  # parallel Jupiter checks; RPS is still capped by the client's rate limiter
 
 
 async def verify_and_recover(
     q_manager: Any,
     jup: JupiterClient,
-    full_tokens: dict[str, Any],
     stable_mint: str,
     stable_decimals: int,
     notional_usd: Decimal,
@@ -40,47 +39,42 @@ async def verify_and_recover(
     Returns count of recovered symbols.
     """
     async with q_manager._file_lock:
-        q = load_quarantine(str(q_manager.quarantine_path))
-        q = prune_expired(q)
+        q = await asyncio.to_thread(load_quarantine, str(q_manager.quarantine_path))
+        q = prune_expired(q, ts=now_ts())
 
     if not q:
         return 0
 
-    symbol_to_info: dict[str, tuple[str, int]] = {}
-    for t in full_tokens.values():
-        sym = getattr(t, "bybit_symbol", None)
-        mint = getattr(t, "mint", None)
-        decimals = getattr(t, "decimals", None)
-        if sym and mint and decimals is not None:
-            symbol_to_info[sym] = (str(mint), int(decimals))
+    symbol_to_info: dict[str, tuple[str, int]] = q_manager.symbol_to_info
 
-    recovered: list[str] = []
-    jup_checks = 0
+    checks: list[tuple[str, str]] = []  # (symbol, reason)
+    reqs: list[tuple[str, str, int]] = []
+    stable_raw = to_raw(notional_usd, stable_decimals)
 
-    for symbol, entry in list(q.items()):
+    for symbol, entry in q.items():
         reason = entry.reason or ""
 
-        if reason in ("JUP_TOKEN_NOT_TRADABLE", "JUP_NO_ROUTE") and jup_checks < MAX_JUP_CHECKS_PER_RUN:
+        if reason in ("JUP_TOKEN_NOT_TRADABLE", "JUP_NO_ROUTE") and len(reqs) < MAX_JUP_CHECKS_PER_RUN:
             info = symbol_to_info.get(symbol)
             if not info:
                 continue
             mint, decimals = info
             if decimals <= 0 or decimals > 18:
                 continue
+            checks.append((symbol, reason))
+            reqs.append((stable_mint, mint, stable_raw))
 
-            stable_raw = to_raw(notional_usd, stable_decimals)
-            quote = await jup.quote_exact_in(stable_mint, mint, stable_raw)
-            jup_checks += 1
-            if jup_checks < MAX_JUP_CHECKS_PER_RUN:
-                await asyncio.sleep(JUP_CHECK_DELAY_SEC)
+        elif reason == "BAD_TOKEN_CFG":
+            pass  # never auto-recover
 
+    recovered: list[str] = []
+    if reqs:
+        quotes = await jup.quote_exact_in_batch(reqs, concurrency=JUP_CHECK_CONCURRENCY)
+        for (symbol, reason), quote in zip(checks, quotes):
             if quote is not None and quote.out_amount_raw > 0:
                 recovered.append(symbol)
                 log.info("Quarantine verify: %s recovered (%s, Jupiter OK)", symbol, reason)
 
-        elif reason == "BAD_TOKEN_CFG":
-            pass  # never auto-recover
-
     if not recovered:
         return 0
 
@@ -96,7 +90,6 @@ async def verify_and_recover(
 async def verify_loop(
     q_manager: Any,
     jup: JupiterClient,
-    full_tokens: dict[str, Any],
     stable_mint: str,
     stable_decimals: int,
     notional_usd: Decimal,
@@ -113,7 +106,6 @@ async def verify_loop(
             await verify_and_recover(
                 q_manager=q_manager,
                 jup=jup,
-                full_tokens=full_tokens,
                 stable_mint=stable_mint,
                 stable_decimals=stable_decimals,
                 notional_usd=notional_usd,
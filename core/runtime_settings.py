@@ -6,13 +6,15 @@ Defaults aligned with core.config (ThresholdsCfg, FiltersCfg, RuntimeCfg, Jupite
 
 from __future__ import annotations
 
+import asyncio
 import json
-from dataclasses import asdict, dataclass, field
+import os
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 
-@dataclass
+@dataclass(slots=True)
 class RuntimeSettings:
     """Mutable settings affecting arb signals. All values can be updated at runtime."""
 
@@ -55,42 +57,38 @@ class RuntimeSettings:
     auto_tune_bounds: dict | None = None
 
     # Human-readable labels for /settings
-    LABELS: dict[str, str] = field(
-        default_factory=lambda: {
-            "bybit_taker_fee_bps": "Комиссия Bybit (bps)",
-            "solana_tx_fee_usd": "Комиссия Solana ($)",
-            "latency_buffer_bps": "Буфер задержки (bps)",
-            "usdt_usdc_buffer_bps": "Буфер USDT/USDC (bps)",
-            "min_profit_usd": "Мин. прибыль ($)",
-            "notional_usd": "Объём сделки ($)",
-            "max_cex_slippage_bps": "Макс. слип CEX (bps)",
-            "max_dex_price_impact_pct": "Макс. импакт DEX (%)",
-            "persistence_hits": "Порог persistence",
-            "cooldown_sec": "Cooldown (сек)",
-            "min_delta_profit_usd_to_resend": "Мин. дельта для ресэнда ($)",
-            "price_ratio_max": "Макс. ratio цен",
-            "gross_profit_cap_pct": "Макс. gross profit (%)",
-            "max_spread_bps": "Макс. спред (bps)",
-            "min_depth_coverage_pct": "Мин. depth coverage (%)",
-            "engine_tick_hz": "Частота тика (Hz)",
-            "jupiter_poll_interval_sec": "Интервал опроса Jupiter (сек)",
-            "max_ob_age_ms": "Макс. возраст стакана (мс)",
-            "stale_ttl_sec": "Время до устаревания сигнала (сек, 0=выкл)",
-            "delete_stale": "Удалять устаревшие (true/false)",
-            "exchange_enabled": "Биржевая логика вкл (true/false)",
-            "auto_tune_enabled": "Авто-подстройка параметров вкл (true/false)",
-        }
-    )
+    LABELS: ClassVar[dict[str, str]] = {
+        "bybit_taker_fee_bps": "Комиссия Bybit (bps)",
+        "solana_tx_fee_usd": "Комиссия Solana ($)",
+        "latency_buffer_bps": "Буфер задержки (bps)",
+        "usdt_usdc_buffer_bps": "Буфер USDT/USDC (bps)",
+        "min_profit_usd": "Мин. прибыль ($)",
+        "notional_usd": "Объём сделки ($)",
+        "max_cex_slippage_bps": "Макс. слип CEX (bps)",
+        "max_dex_price_impact_pct": "Макс. импакт DEX (%)",
+        "persistence_hits": "Порог persistence",
+        "cooldown_sec": "Cooldown (сек)",
+        "min_delta_profit_usd_to_resend": "Мин. дельта для ресэнда ($)",
+        "price_ratio_max": "Макс. ratio цен",
+        "gross_profit_cap_pct": "Макс. gross profit (%)",
+        "max_spread_bps": "Макс. спред (bps)",
+        "min_depth_coverage_pct": "Мин. depth coverage (%)",
+        "engine_tick_hz": "Частота тика (Hz)",
+        "jupiter_poll_interval_sec": "Интервал опроса Jupiter (сек)",
+        "max_ob_age_ms": "Макс. возраст стакана (мс)",
+        "stale_ttl_sec": "Время до устаревания сигнала (сек, 0=выкл)",
+        "delete_stale": "Удалять устаревшие (true/false)",
+        "exchange_enabled": "Биржевая логика вкл (true/false)",
+        "auto_tune_enabled": "Авто-подстройка параметров вкл (true/false)",
+    }
 
     def to_dict(self) -> dict[str, Any]:
-        d = asdict(self)
-        d.pop("LABELS", None)
-        return d
+        return asdict(self)
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> RuntimeSettings:
         s = cls()
-        valid = {f for f in cls.__dataclass_fields__ if f != "LABELS"}
+        valid = cls.__dataclass_fields__
         for k, v in (d or {}).items():
             if k in valid:
                 s.update(k, v)
@@ -152,8 +150,6 @@ class RuntimeSettings:
             "<b>Текущие значения:</b>",
         ]
         for k, v in self.to_dict().items():
-            if k == "LABELS":
-                continue
             lines.append(f"• <code>{k}</code>: {v}")
         lines.append("")
         lines.append("<b>Изменить:</b> <code>/settings min_profit_usd 20</code>")
@@ -206,17 +202,32 @@ class RuntimeSettings:
 def load_runtime_settings(path: str, defaults: RuntimeSettings | None = None) -> RuntimeSettings:
     s = defaults or RuntimeSettings()
     try:
-        with open(path, encoding="utf-8") as f:
-            d = json.load(f)
+        d = json.loads(Path(path).read_bytes())
         for k, v in (d or {}).items():
             s.update(k, v)
-    except (FileNotFoundError, json.JSONDecodeError, TypeError):
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, TypeError):
         pass
     return s
 
 
+def _write_settings(path: str, text: str) -> None:
+    # Write a sibling temp file and swap it in: readers never see a truncated settings.json
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, target)
+
+
 def save_runtime_settings(path: str, s: RuntimeSettings) -> None:
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    d = {k: v for k, v in s.to_dict().items() if k != "LABELS"}
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(d, f, indent=2, ensure_ascii=False)
+    _write_settings(path, json.dumps(s.to_dict(), indent=2, ensure_ascii=False))
+
+
+# Serializes async saves (auto-tune, /settings handlers): the latest snapshot is always written last
+_save_lock = asyncio.Lock()
+
+
+async def save_runtime_settings_async(path: str, s: RuntimeSettings) -> None:
+    """Non-blocking save. Use in async context: serializes here, writes the file in a thread."""
+    async with _save_lock:
+        await asyncio.to_thread(_write_settings, path, json.dumps(s.to_dict(), indent=2, ensure_ascii=False))
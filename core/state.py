@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import time
 from dataclasses import dataclass, field
 
@@ -11,19 +10,39 @@ from core.orderbook import OrderBook
 @dataclass
 class QuotePair:
     """
-    Quotes for one token. Protected by per-token lock so we can:
-      - update buy/sell independently
-      - take an atomic-ish snapshot inside the engine tick
+    Quotes for one token. Each side is published as one immutable tuple, so a
+    single attribute read always yields a consistent (quote, ts, ...) snapshot
+    and writers need no lock: set_buy()/set_sell() swap in a fresh tuple.
     """
 
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    buy: tuple[JupQuote | None, int] = (None, 0)  # (quote, updated_ms)
+    sell: tuple[JupQuote | None, int, int] = (None, 0, 0)  # (quote, updated_ms, amount_raw)
 
-    buy_quote: JupQuote | None = None
-    buy_updated_ms: int = 0
+    def set_buy(self, quote: JupQuote | None, updated_ms: int) -> None:
+        self.buy = (quote, int(updated_ms))
 
-    sell_quote: JupQuote | None = None
-    sell_updated_ms: int = 0
-    sell_amount_raw: int = 0
+    def set_sell(self, quote: JupQuote | None, updated_ms: int, amount_raw: int) -> None:
+        self.sell = (quote, int(updated_ms), int(amount_raw))
+
+    @property
+    def buy_quote(self) -> JupQuote | None:
+        return self.buy[0]
+
+    @property
+    def buy_updated_ms(self) -> int:
+        return self.buy[1]
+
+    @property
+    def sell_quote(self) -> JupQuote | None:
+        return self.sell[0]
+
+    @property
+    def sell_updated_ms(self) -> int:
+        return self.sell[1]
+
+    @property
+    def sell_amount_raw(self) -> int:
+        return self.sell[2]
 
 
 @dataclass
@@ -31,31 +50,24 @@ class MarketState:
     orderbooks: dict[str, OrderBook] = field(default_factory=dict)
     quotes: dict[str, QuotePair] = field(default_factory=dict)
 
-    # Backward compatible: lock for orderbooks
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    # New: separate lock for quotes map
-    quotes_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-
-    async def upsert_orderbook(self, symbol: str) -> OrderBook:
-        async with self.lock:
-            ob = self.orderbooks.get(symbol)
-            if ob is None:
-                ob = OrderBook(symbol=symbol)
-                self.orderbooks[symbol] = ob
-            return ob
-
-    async def get_orderbook(self, symbol: str) -> OrderBook | None:
-        async with self.lock:
-            return self.orderbooks.get(symbol)
-
-    async def get_quote_pair(self, token_key: str) -> QuotePair:
-        async with self.quotes_lock:
-            qp = self.quotes.get(token_key)
-            if qp is None:
-                qp = QuotePair()
-                self.quotes[token_key] = qp
-            return qp
+    # Plain methods: everything runs on one event loop, so these dict operations can't interleave
+    # with a writer and need neither a lock nor an await.
+
+    def upsert_orderbook(self, symbol: str) -> OrderBook:
+        ob = self.orderbooks.get(symbol)
+        if ob is None:
+            ob = self.orderbooks.setdefault(symbol, OrderBook(symbol=symbol))
+        return ob
+
+    def get_orderbook(self, symbol: str) -> OrderBook | None:
+        return self.orderbooks.get(symbol)
+
+    def get_quote_pair(self, token_key: str) -> QuotePair:
+        qp = self.quotes.get(token_key)
+        if qp is None:
+            qp = self.quotes.setdefault(token_key, QuotePair())
+        return qp
 
     @staticmethod
     def now_ms() -> int:
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from decimal import Decimal
 
+_ZERO = Decimal("0")
+_BPS = Decimal("10000")
+
 
 @dataclass
 class SimResult:
-    base_out: Decimal
-    quote_out: Decimal
-    avg_price: Decimal
-    slippage_bps: Decimal
+    # Decimal from the (price, qty) tuple simulators, float from the *_soa ones
+    base_out: Decimal | float
+    quote_out: Decimal | float
+    avg_price: Decimal | float
+    slippage_bps: Decimal | float
 
 
 def simulate_buy_with_notional(asks: list[tuple[Decimal, Decimal]], notional: Decimal) -> SimResult | None:
@@ -18,8 +23,8 @@ def simulate_buy_with_notional(asks: list[tuple[Decimal, Decimal]], notional: De
 
     best_ask = asks[0][0]
     remaining_quote = notional
-    base_got = Decimal("0")
-    quote_spent = Decimal("0")
+    base_got = _ZERO
+    quote_spent = _ZERO
 
     for price, qty in asks:
         if remaining_quote <= 0:
@@ -39,7 +44,7 @@ def simulate_buy_with_notional(asks: list[tuple[Decimal, Decimal]], notional: De
         return None
 
     avg_price = quote_spent / base_got
-    slippage_bps = (avg_price / best_ask - 1) * Decimal("10000")
+    slippage_bps = (avg_price / best_ask - 1) * _BPS
 
     return SimResult(base_out=base_got, quote_out=quote_spent, avg_price=avg_price, slippage_bps=slippage_bps)
 
@@ -50,8 +55,8 @@ def simulate_sell_base(bids: list[tuple[Decimal, Decimal]], base_amount: Decimal
 
     best_bid = bids[0][0]
     remaining_base = base_amount
-    quote_got = Decimal("0")
-    base_sold = Decimal("0")
+    quote_got = _ZERO
+    base_sold = _ZERO
 
     for price, qty in bids:
         if remaining_base <= 0:
@@ -70,6 +75,66 @@ def simulate_sell_base(bids: list[tuple[Decimal, Decimal]], base_amount: Decimal
         return None
 
     avg_price = quote_got / base_sold
-    slippage_bps = (1 - avg_price / best_bid) * Decimal("10000")
+    slippage_bps = (1 - avg_price / best_bid) * _BPS
+
+    return SimResult(base_out=base_sold, quote_out=quote_got, avg_price=avg_price, slippage_bps=slippage_bps)
+
+
+# Float variants over parallel price/qty arrays (OrderBook.float_levels()); same fill logic as above.
+
+
+def simulate_buy_soa(prices: Sequence[float], sizes: Sequence[float], notional: float) -> SimResult | None:
+    if not prices or notional <= 0:
+        return None
+
+    remaining_quote = notional
+    base_got = 0.0
+    quote_spent = 0.0
+
+    for price, qty in zip(prices, sizes):
+        if remaining_quote <= 0:
+            break
+        if price <= 0 or qty <= 0:
+            continue
+
+        take_base = min(qty, remaining_quote / price)
+        spent = take_base * price
+        base_got += take_base
+        quote_spent += spent
+        remaining_quote -= spent
+
+    if base_got == 0:
+        return None
+
+    avg_price = quote_spent / base_got
+    slippage_bps = (avg_price / prices[0] - 1) * 10000.0
+
+    return SimResult(base_out=base_got, quote_out=quote_spent, avg_price=avg_price, slippage_bps=slippage_bps)
+
+
+def simulate_sell_soa(prices: Sequence[float], sizes: Sequence[float], base_amount: float) -> SimResult | None:
+    if not prices or base_amount <= 0:
+        return None
+
+    remaining_base = base_amount
+    quote_got = 0.0
+    base_sold = 0.0
+
+    for price, qty in zip(prices, sizes):
+        if remaining_base <= 0:
+            break
+        if price <= 0 or qty <= 0:
+            continue
+
+        take_base = min(qty, remaining_base)
+        base_sold += take_base
+        quote_got += take_base * price
+        remaining_base -= take_base
+
+    if base_sold == 0:
+        return None
+
+    avg_price = quote_got / base_sold
+    slippage_bps = (1 - avg_price / prices[0]) * 10000.0
 
     return SimResult(base_out=base_sold, quote_out=quote_got, avg_price=avg_price, slippage_bps=slippage_bps)
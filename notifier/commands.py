@@ -13,7 +13,7 @@ from typing import Any
 
 import aiohttp
 
-from core.runtime_settings import RuntimeSettings, save_runtime_settings
+from core.runtime_settings import RuntimeSettings, save_runtime_settings_async
 
 log = logging.getLogger("commands")
 
@@ -214,13 +214,13 @@ async def run_settings_command_handler(
                     rest = text[len(cmd) :].strip().lower()
                     if rest in ("on", "1", "yes", "вкл", "включить"):
                         settings.exchange_enabled = True
-                        save_runtime_settings(settings_path, settings)
+                        await save_runtime_settings_async(settings_path, settings)
                         await on_exchange_toggle(True)
                         await send("✅ Биржевая логика <b>включена</b> (Jupiter, Bybit, арбитраж)")
                         continue
                     if rest in ("off", "0", "no", "выкл", "выключить"):
                         settings.exchange_enabled = False
-                        save_runtime_settings(settings_path, settings)
+                        await save_runtime_settings_async(settings_path, settings)
                         await on_exchange_toggle(False)
                         await send("⏸ Биржевая логика <b>выключена</b> (запросы к биржам остановлены)")
                         continue
@@ -267,7 +267,7 @@ async def run_settings_command_handler(
                     await send(f"❌ Неизвестный параметр: {key}\nСписок: /settings")
                     continue
 
-                save_runtime_settings(settings_path, settings)
+                await save_runtime_settings_async(settings_path, settings)
                 on_reload(settings)
                 if key == "exchange_enabled" and on_exchange_toggle is not None:
                     await on_exchange_toggle(bool(settings.exchange_enabled))
@@ -0,0 +1,47 @@
+"""Tests for core.arb.dedup and core.arb.persistence."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import core.arb.dedup as dedup_mod
+from core.arb.dedup import Dedup
+from core.arb.persistence import Persistence
+
+
+def test_dedup_cooldown_and_profit_delta():
+    d = Dedup(cooldown_sec=60, min_delta_profit=Decimal("1"))
+    assert d.can_send("k", Decimal("5"))
+    d.mark_sent("k", Decimal("5"))
+    assert not d.can_send("k", Decimal("5.5"))
+    assert d.can_send("k", Decimal("6"))
+
+
+def test_dedup_cooldown_ignores_wall_clock(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(dedup_mod.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(dedup_mod.time, "time", lambda: 0.0)  # wall clock jumped back
+    d = Dedup(cooldown_sec=60, min_delta_profit=Decimal("1"))
+    d.mark_sent("k", Decimal("5"))
+    assert not d.can_send("k", Decimal("5"))
+    clock[0] += 61
+    assert d.can_send("k", Decimal("5"))
+
+
+def test_dedup_evicts_least_recently_sent():
+    d = Dedup(cooldown_sec=60, min_delta_profit=Decimal("1"), max_entries=2)
+    d.mark_sent("a", Decimal("1"))
+    d.mark_sent("b", Decimal("1"))
+    d.mark_sent("a", Decimal("1"))
+    d.mark_sent("c", Decimal("1"))
+    assert list(d._last_sent) == ["a", "c"]
+
+
+def test_persistence_only_stores_running_streaks():
+    p = Persistence(2)
+    assert not p.hit("k", True)
+    assert p.hit("k", True)
+    assert p._cnt == {}
+    assert not p.hit("k", True)
+    assert not p.hit("k", False)
+    assert p._cnt == {}
@@ -0,0 +1,28 @@
+"""Tests for core.arb.denylist."""
+
+from __future__ import annotations
+
+from core.arb.denylist import Denylist
+
+
+def test_defaults_and_regex():
+    d = Denylist.build(symbols=["foo"])
+    assert d.is_denied("XAUT", "XAUTUSDT")
+    assert d.is_denied("x", "1000BONKUSDT")
+    assert d.is_denied("FOO", "FOOUSDT")
+    assert not d.is_denied("SOL", "SOLUSDT")
+
+
+def test_is_denied_is_memoized():
+    d = Denylist.build(symbols=["foo"])
+    assert d.is_denied("FOO", "FOOUSDT")
+    assert not d.is_denied("SOL", "SOLUSDT")
+    assert d._memo == {("FOO", "FOOUSDT"): True, ("SOL", "SOLUSDT"): False}
+    assert d.is_denied("FOO", "FOOUSDT")
+
+
+def test_pattern_with_global_flags_still_applies():
+    d = Denylist.build(regex=["(?i)^scam", "^FOO$"])
+    assert d.is_denied("SCAMCOIN", "SCAMCOINUSDT")
+    assert d.is_denied("FOO", "FOOUSDT")
+    assert not d.is_denied("BAR", "BARUSDT")
@@ -0,0 +1,50 @@
+"""Tests for core.arb.engine."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from core.arb.engine import ArbEngine
+from core.fees import Thresholds
+from core.state import MarketState
+
+
+def _engine(state: MarketState) -> ArbEngine:
+    return ArbEngine(
+        state,
+        None,  # type: ignore[arg-type]
+        Thresholds(Decimal("10"), Decimal("0.05"), Decimal("5"), Decimal("5"), Decimal("0.5")),
+        notional_usd=Decimal("100"),
+        stable_mint="usdc",
+        stable_decimals=6,
+        token_cfgs={"SOL": {"mint": "m", "bybit_symbol": "SOLUSDT", "decimals": 9}},
+        max_cex_slippage_bps=Decimal("30"),
+        max_dex_price_impact_pct=Decimal("0.5"),
+        persistence_hits=1,
+        cooldown_sec=60,
+        min_delta_profit_usd_to_resend=Decimal("0.5"),
+        engine_tick_hz=20,
+        jupiter_poll_interval_sec=1.0,
+    )
+
+
+async def test_unchanged_settled_token_is_skipped_until_book_changes():
+    state = MarketState()
+    eng = _engine(state)
+    ob = state.upsert_orderbook("SOLUSDT")
+    # Too thin for the B branch and no buy quote: both branches settle without a requote
+    now = state.now_ms()
+    ob.apply_snapshot([["0.999", "1"]], [["1.001", "1"]], now, now)
+
+    async def on_signal(sig) -> None:
+        raise AssertionError("no signal expected")
+
+    cfg = eng.token_cfgs["SOL"]
+    await eng._run_one_token("SOL", cfg, on_signal)
+    assert eng._skip_stats.snapshot().get("skip_unchanged", 0) == 0
+    await eng._run_one_token("SOL", cfg, on_signal)
+    assert eng._skip_stats.snapshot()["skip_unchanged"] == 1
+
+    ob.apply_delta([["0.998", "1"]], [], state.now_ms(), state.now_ms())
+    await eng._run_one_token("SOL", cfg, on_signal)
+    assert eng._skip_stats.snapshot()["skip_unchanged"] == 1
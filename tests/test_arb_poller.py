@@ -0,0 +1,117 @@
+"""Tests for core.arb.poller."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from decimal import Decimal
+
+from connectors.jupiter import JupQuote
+from core.arb.denylist import Denylist
+from core.arb.poller import POLL_BACKOFF_CAP_SEC, QuotePoller
+from core.state import MarketState
+
+
+def _poller(state: MarketState | None = None) -> QuotePoller:
+    return QuotePoller(
+        state=state,  # type: ignore[arg-type]
+        jup=None,  # type: ignore[arg-type]
+        token_cfgs={"SOL": {"mint": "m", "bybit_symbol": "SOLUSDT", "decimals": 9}},
+        stable_mint="usdc",
+        stable_decimals=6,
+        notional=Decimal("100"),
+        denylist=Denylist.build(),
+        max_spread_bps=Decimal("50"),
+        max_ob_age_ms=2000,
+        poll_interval_sec=1.0,
+        max_quote_age_ms=3000,
+    )
+
+
+def test_poll_backoff_grows_exponentially_and_is_capped():
+    p = _poller()
+    for n in range(1, 12):
+        t0 = time.monotonic()
+        p._poll_backoff("SOL", 5.0)
+        delay = min(POLL_BACKOFF_CAP_SEC, 5.0 * 2 ** (n - 1))
+        wait = p._poll_backoff_until["SOL"] - t0
+        assert delay * 0.5 - 0.01 <= wait <= delay + 0.01
+    assert not p._poll_allowed("SOL")
+
+
+def test_poll_success_resets_backoff():
+    p = _poller()
+    p._poll_backoff("SOL", 5.0)
+    p._poll_backoff("SOL", 5.0)
+    p._poll_success("SOL")
+    assert p._poll_allowed("SOL")
+    assert "SOL" not in p._poll_fail_count
+
+
+async def test_interruptible_sleep_returns_on_stop():
+    p = _poller()
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.01, p.stop)
+    t0 = time.monotonic()
+    await p._interruptible_sleep(5.0)
+    assert time.monotonic() - t0 < 1.0
+
+
+async def test_spread_gate_matches_bps_threshold():
+    state = MarketState()
+    p = _poller(state)  # max_spread_bps=50
+    ob = state.upsert_orderbook("SOLUSDT")
+    for ask, ok in (("100.49", True), ("100.51", False)):
+        ob.apply_snapshot(bids=[["100", "1"]], asks=[[ask, "1"]], ts_ms=state.now_ms(), cts_ms=state.now_ms())
+        assert p._ob_ok("SOL", "SOLUSDT") is ok
+
+
+def test_adapt_concurrency_halves_on_failures_and_recovers():
+    p = _poller()
+    full = p.poll_concurrency
+    p._adapt_concurrency(10, 8)
+    assert p._poll_cap == full // 2
+    p._adapt_concurrency(10, 0)
+    assert p._poll_cap == full // 2 + 1
+
+
+async def test_quotes_are_stamped_as_each_completes():
+    state = MarketState()
+    now = state.now_ms()
+    for sym in ("AAAUSDT", "BBBUSDT"):
+        state.upsert_orderbook(sym).apply_snapshot(bids=[["100", "1"]], asks=[["100.1", "1"]], ts_ms=now, cts_ms=now)
+
+    class SlowJup:
+        retryable_failures = 0
+
+        async def quote_exact_in_batch(self, reqs, concurrency=8, on_result=None):
+            out = []
+            for i, (inp, outp, amt) in enumerate(reqs):
+                await asyncio.sleep(0.05 * i)
+                out.append(JupQuote(inp, outp, amt, 1, Decimal("0"), 0, 0))
+                on_result(i, out[i])
+            return out
+
+    p = QuotePoller(
+        state=state,
+        jup=SlowJup(),  # type: ignore[arg-type]
+        token_cfgs={
+            "AAA": {"mint": "ma", "bybit_symbol": "AAAUSDT", "decimals": 9},
+            "BBB": {"mint": "mb", "bybit_symbol": "BBBUSDT", "decimals": 9},
+        },
+        stable_mint="usdc",
+        stable_decimals=6,
+        notional=Decimal("100"),
+        denylist=Denylist.build(),
+        max_spread_bps=Decimal("50"),
+        max_ob_age_ms=60_000,
+        poll_interval_sec=10.0,
+        max_quote_age_ms=3000,
+    )
+    task = asyncio.create_task(p.run())
+    await asyncio.sleep(0.2)
+    p.stop()
+    await asyncio.wait_for(task, 2)
+
+    a, b = state.quotes["AAA"].buy_updated_ms, state.quotes["BBB"].buy_updated_ms
+    assert b - a >= 40
@@ -0,0 +1,66 @@
+"""Tests for core.arb.stats."""
+
+from __future__ import annotations
+
+import pytest
+
+from core.arb import stats as stats_mod
+from core.arb.stats import SkipStats
+
+
+class _Clock:
+    def __init__(self, t: float) -> None:
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    c = _Clock(1000.0)
+    monkeypatch.setattr(stats_mod.time, "monotonic", c)
+    return c
+
+
+def test_snapshot_is_sliding(clock: _Clock):
+    s = SkipStats(window_sec=10)
+    s.inc("a")
+    clock.t += 5
+    s.inc("a", 2)
+    s.inc("b")
+    assert s.snapshot() == {"a": 3, "b": 1}
+    clock.t += 6
+    # the first bump is older than 10s now
+    assert s.snapshot() == {"a": 2, "b": 1}
+    clock.t += 100
+    assert s.snapshot() == {}
+
+
+def test_flushes_do_not_overlap_or_lose_counts(clock: _Clock):
+    s = SkipStats(window_sec=10)
+    total = 0
+    flushed = 0
+    for _ in range(95):
+        s.inc("k")
+        total += 1
+        clock.t += 0.5
+        data = s.flush_if_due()
+        if data is not None:
+            flushed += data.get("k", 0)
+    clock.t += 10
+    flushed += (s.flush_if_due() or {}).get("k", 0)
+    assert flushed == total
+
+
+def test_flush_not_due(clock: _Clock):
+    s = SkipStats(window_sec=10)
+    s.inc("k")
+    assert s.flush_if_due(clock.t + 1) is None
+
+
+def test_inc_many(clock: _Clock):
+    s = SkipStats(window_sec=10)
+    s.inc("a")
+    s.inc_many({"a": 2, "b": 3})
+    assert s.snapshot() == {"a": 3, "b": 3}
@@ -0,0 +1,28 @@
+"""Tests for core.arb.types."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from core.arb.types import Signal, TokenCfgs, cfg_items
+
+
+def test_token_cfgs_snapshot_reused_until_mutation():
+    cfgs = TokenCfgs()
+    cfgs["A"] = {"mint": "a"}
+    snap = cfg_items(cfgs)
+    assert snap == [("A", {"mint": "a"})]
+    assert cfg_items(cfgs) is snap
+    cfgs.clear()
+    cfgs["B"] = {"mint": "b"}
+    assert cfg_items(cfgs) == [("B", {"mint": "b"})]
+
+
+def test_cfg_items_plain_dict():
+    assert cfg_items({"A": {}}) == [("A", {})]
+
+
+def test_signal_reply_markup():
+    sig = Signal("k", "T", "JUP->BYBIT", Decimal("1"), Decimal("100"), "text", [[("Buy", "https://x")]])
+    assert sig.to_reply_markup() == {"inline_keyboard": [[{"text": "Buy", "url": "https://x"}]]}
+    assert Signal("k", "T", "JUP->BYBIT", Decimal("1"), Decimal("100"), "text").to_reply_markup() is None
@@ -0,0 +1,53 @@
+"""Tests for core.arb.utils."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from core.arb.utils import best_levels, from_raw, snapshot_book, to_raw
+from core.orderbook import OrderBook
+
+
+def _book() -> OrderBook:
+    ob = OrderBook(symbol="BTCUSDT")
+    ob.apply_snapshot(
+        bids=[["99.5", "1"], ["100", "2"], ["98", "3"]],
+        asks=[["101", "1"], ["100.5", "4"], ["103", "2"]],
+        ts_ms=1,
+        cts_ms=1,
+    )
+    return ob
+
+
+def test_best_levels_matches_sorted_snapshot():
+    ob = _book()
+    bids, asks = snapshot_book(ob)
+    assert best_levels(ob) == (bids[0], asks[0])
+    assert best_levels(ob) == ((Decimal("100"), Decimal("2")), (Decimal("100.5"), Decimal("4")))
+
+
+def test_best_levels_empty_side():
+    ob = OrderBook(symbol="BTCUSDT")
+    ob.apply_snapshot(bids=[["100", "1"]], asks=[], ts_ms=1, cts_ms=1)
+    assert best_levels(ob) is None
+
+
+def test_to_raw_rounds_down():
+    assert to_raw(Decimal("1.2345679"), 6) == 1234567
+    assert to_raw(Decimal("1000"), 6) == 1_000_000_000
+    assert to_raw(5, 0) == 5
+
+
+def test_from_raw_roundtrip():
+    assert from_raw(1_234_567, 6) == Decimal("1.234567")
+    assert from_raw(to_raw(Decimal("0.5"), 9), 9) == Decimal("0.5")
+
+
+def test_snapshot_book_is_cached_until_next_update():
+    ob = _book()
+    first = snapshot_book(ob)
+    assert snapshot_book(ob)[0] is first[0]
+    ob.apply_delta(bids=[["100", "0"]], asks=[], ts_ms=2, cts_ms=2)
+    bids, _asks = snapshot_book(ob)
+    assert bids is not first[0]
+    assert bids[0] == (Decimal("99.5"), Decimal("1"))
@@ -0,0 +1,38 @@
+"""Tests for core.auto_tune.metrics."""
+
+from __future__ import annotations
+
+import core.auto_tune.metrics as metrics_mod
+from core.auto_tune.metrics import MetricsCollector
+
+
+def test_window_stats_aggregate_a_and_b_skip_keys():
+    m = MetricsCollector()
+    m.record_skips({"A_skip_profit_le0": 3, "B_skip_profit_le0": 2, "skip_spread": 1, "poll_skip_spread": 4})
+    m.record_skips({"B_skip_cex_slip": 7, "A_skip_dedup": 1, "unrelated": 9})
+    m.record_signal()
+
+    stats = m.get_window_stats()
+    assert stats["signals_sent"] == 1
+    assert stats["skip_profit_le0"] == 5
+    assert stats["skip_spread"] == 5
+    assert stats["skip_cex_slip"] == 7
+    assert stats["skip_dedup"] == 1
+    assert stats["skip_persistence"] == 0
+    assert stats["skip_depth"] == 0
+    assert stats["events_count"] == 2
+
+
+def test_expired_events_are_subtracted_from_totals(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(metrics_mod.time, "monotonic", lambda: clock[0])
+    m = MetricsCollector(window_sec=60)
+    m.record_skips({"A_skip_depth": 4})
+    clock[0] += 30
+    m.record_skips({"B_skip_depth": 1})
+    assert m.get_window_stats()["skip_depth"] == 5
+
+    clock[0] += 40
+    stats = m.get_window_stats()
+    assert stats["skip_depth"] == 1
+    assert stats["events_count"] == 1
@@ -0,0 +1,44 @@
+"""Tests for core.auto_tune.tuner."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from core.auto_tune.tuner import AutoTuner, TunerBounds
+
+
+def _settings(**kw):
+    base = {"min_profit_usd": 1.0, "persistence_hits": 2, "cooldown_sec": 60, "max_spread_bps": 50.0}
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def test_lowers_min_profit_but_not_below_bound():
+    t = AutoTuner()
+    metrics = {"signals_sent": 0, "skip_profit_le0": 10, "events_count": 5}
+    (ch,) = t.evaluate(metrics, _settings(min_profit_usd=0.3))  # type: ignore[arg-type]
+    assert (ch.param, ch.new_value) == ("min_profit_usd", 0.1)
+    assert t.evaluate(metrics, _settings(min_profit_usd=0.1)) == []  # type: ignore[arg-type]
+
+
+def test_no_step_when_setting_is_already_outside_bounds():
+    t = AutoTuner()
+    metrics = {"signals_sent": 0, "skip_profit_le0": 10, "events_count": 5}
+    bounds = TunerBounds(min_profit_usd={"min": 2.0, "max": 5.0})
+    # Lowering from below the minimum must not turn into a raise
+    assert t.evaluate(metrics, _settings(min_profit_usd=1.0), bounds) == []  # type: ignore[arg-type]
+
+
+def test_raises_cooldown_on_dedup_skips():
+    t = AutoTuner()
+    metrics = {"signals_sent": 5, "skip_dedup": 40, "events_count": 5}
+    (ch,) = t.evaluate(metrics, _settings(cooldown_sec=298))  # type: ignore[arg-type]
+    assert (ch.param, ch.old_value, ch.new_value) == ("cooldown_sec", 298, 300)
+
+
+def test_out_of_range_setting_moves_one_step_at_a_time():
+    t = AutoTuner()
+    metrics = {"signals_sent": 5, "skip_persistence": 30, "events_count": 5}
+    # persistence_hits_max defaults to 5: the rule still takes a single step down, not a jump to the bound
+    (ch,) = t.evaluate(metrics, _settings(persistence_hits=8))  # type: ignore[arg-type]
+    assert (ch.param, ch.old_value, ch.new_value) == ("persistence_hits", 8, 7)
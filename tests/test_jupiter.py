@@ -0,0 +1,141 @@
+"""Tests for connectors.jupiter."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+from connectors.jupiter import JupiterBatcher, JupiterClient, JupQuote
+
+
+async def test_quote_exact_in_batch_keeps_order_and_bounds_concurrency():
+    client = JupiterClient.__new__(JupiterClient)
+    in_flight = 0
+    peak = 0
+
+    async def fake_quote(input_mint: str, output_mint: str, amount_raw: int) -> JupQuote | None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 * (int(output_mint) % 3))
+        in_flight -= 1
+        if output_mint == "4":
+            return None
+        if output_mint == "5":
+            raise RuntimeError("boom")
+        return JupQuote(input_mint, output_mint, amount_raw, int(output_mint), Decimal("0"), 0, 0)
+
+    client.quote_exact_in = fake_quote  # type: ignore[method-assign]
+    reqs = [("S", str(i), 100) for i in range(10)]
+    seen: list[int] = []
+    out = await client.quote_exact_in_batch(reqs, concurrency=3, on_result=lambda i, q: seen.append(i))
+
+    assert peak <= 3
+    assert sorted(seen) == list(range(10))
+    assert [q.output_mint if q else None for q in out] == ["0", "1", "2", "3", None, None, "6", "7", "8", "9"]
+
+
+async def test_quote_exact_in_counts_only_retryable_failures():
+    class FakeResp:
+        def __init__(self, status: int, body: str) -> None:
+            self.status = status
+            self.headers = {"Retry-After": "0"}
+            self._body = body
+
+        async def __aenter__(self) -> FakeResp:
+            return self
+
+        async def __aexit__(self, *exc: object) -> None:
+            return None
+
+        async def text(self) -> str:
+            return self._body
+
+        async def read(self) -> bytes:
+            return self._body.encode()
+
+    class FakeSession:
+        def __init__(self, responses: list[tuple[int, str]]) -> None:
+            self.responses = responses
+
+        def get(self, *args: object, **kwargs: object) -> FakeResp:
+            return FakeResp(*self.responses.pop(0))
+
+    no_route = '{"errorCode": "COULD_NOT_FIND_ANY_ROUTE", "error": "no route"}'
+    ok = '{"outAmount": "5"}'
+    session = FakeSession([(400, no_route), (429, ""), (503, ""), (200, ok)])
+    client = JupiterClient(session, "http://jup", "", 5.0, 50, True, 64, rps=1000.0)  # type: ignore[arg-type]
+
+    assert await client.quote_exact_in("S", "A", 100) is None
+    assert await client.quote_exact_in("S", "A", 100) is None  # negative-cache hit
+    assert client.retryable_failures == 0
+    q = await client.quote_exact_in("S", "B", 100)
+    assert q is not None and q.out_amount_raw == 5
+    assert client.retryable_failures == 1
+
+
+async def test_batcher_coalesces_concurrent_requests():
+    calls: list[int] = []
+
+    class FakeJup:
+        async def quote_exact_in_batch(self, reqs, concurrency=8, on_result=None):
+            calls.append(len(reqs))
+            return [JupQuote(i, o, a, a * 2, Decimal("0"), 0, 0) for i, o, a in reqs]
+
+    batcher = JupiterBatcher(FakeJup(), window_ms=20)  # type: ignore[arg-type]
+    out = await asyncio.gather(*(batcher.request("M", "S", n) for n in range(1, 6)))
+    await batcher.aclose()
+
+    assert [q.out_amount_raw for q in out] == [2, 4, 6, 8, 10]
+    assert calls == [5]
+
+
+async def test_batcher_respects_max_batch_for_queued_requests():
+    calls: list[int] = []
+
+    class FakeJup:
+        async def quote_exact_in_batch(self, reqs, concurrency=8, on_result=None):
+            calls.append(len(reqs))
+            return [JupQuote(i, o, a, a, Decimal("0"), 0, 0) for i, o, a in reqs]
+
+    batcher = JupiterBatcher(FakeJup(), window_ms=20, max_batch=4)  # type: ignore[arg-type]
+    out = await asyncio.gather(*(batcher.request("M", "S", n) for n in range(1, 11)))
+    await batcher.aclose()
+
+    assert [q.out_amount_raw for q in out] == list(range(1, 11))
+    assert calls == [4, 4, 2]
+
+
+async def test_batcher_resolves_each_request_as_it_completes():
+    class FakeJup:
+        async def quote_exact_in_batch(self, reqs, concurrency=8, on_result=None):
+            out = []
+            for i, (inp, o, a) in enumerate(reqs):
+                await asyncio.sleep(0.02 if a == 1 else 0.3)
+                out.append(JupQuote(inp, o, a, a, Decimal("0"), 0, 0))
+                on_result(i, out[i])
+            return out
+
+    loop = asyncio.get_running_loop()
+    batcher = JupiterBatcher(FakeJup(), window_ms=5)  # type: ignore[arg-type]
+    t0 = loop.time()
+    fast = asyncio.create_task(batcher.request("M", "S", 1))
+    slow = asyncio.create_task(batcher.request("M", "S", 2))
+    assert (await fast).out_amount_raw == 1
+    assert loop.time() - t0 < 0.2
+    assert not slow.done()
+    await batcher.aclose()
+    assert slow.cancelled()
+
+
+async def test_batcher_aclose_cancels_queued_requests():
+    class StuckJup:
+        async def quote_exact_in_batch(self, reqs, concurrency=8, on_result=None):
+            await asyncio.sleep(10)
+
+    batcher = JupiterBatcher(StuckJup(), window_ms=50)  # type: ignore[arg-type]
+    reqs = [asyncio.create_task(batcher.request("M", "S", n)) for n in range(3)]
+    await asyncio.sleep(0.01)
+    await batcher.aclose()
+    await asyncio.gather(*reqs, return_exceptions=True)
+    assert all(r.cancelled() for r in reqs)
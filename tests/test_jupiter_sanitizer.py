@@ -0,0 +1,19 @@
+"""Tests for core.jupiter_sanitizer."""
+
+from __future__ import annotations
+
+from core.jupiter_sanitizer import JUP_MAX_QUARANTINES_PER_MIN, make_on_jup_skip
+
+
+async def test_not_tradable_quarantines_are_rate_limited():
+    quarantined: list[str] = []
+
+    async def quarantine_add(symbol: str, reason: str, ttl: int) -> None:
+        quarantined.append(symbol)
+
+    mints = {f"m{i}": f"T{i}USDT" for i in range(20)}
+    on_skip = make_on_jup_skip("usdc", mints, quarantine_add)
+    for mint in mints:
+        await on_skip("TOKEN_NOT_TRADABLE", "usdc", mint, "", "")
+
+    assert quarantined == [f"T{i}USDT" for i in range(JUP_MAX_QUARANTINES_PER_MIN)]
@@ -0,0 +1,49 @@
+"""Tests for core.orderbook."""
+
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+from core.orderbook import OrderBook, _parse_price
+
+
+def test_sorted_views_track_random_deltas():
+    rng = random.Random(7)
+    ob = OrderBook(symbol="SOLUSDT")
+    ob.apply_snapshot(bids=[["99", "1"], ["98", "2"]], asks=[["101", "1"], ["102", "2"]], ts_ms=1, cts_ms=1)
+    for ts in range(2, 300):
+        bids = [[f"{rng.randint(90, 99)}.{rng.randint(0, 9)}", str(rng.choice([0, 0, 1, 2]))] for _ in range(3)]
+        asks = [[f"{rng.randint(101, 110)}.{rng.randint(0, 9)}", str(rng.choice([0, 0, 1, 2]))] for _ in range(3)]
+        ob.apply_delta(bids=bids, asks=asks, ts_ms=ts, cts_ms=ts)
+        assert ob.bids_sorted() == sorted(ob.bids.items(), reverse=True)
+        assert ob.asks_sorted() == sorted(ob.asks.items())
+        assert ob.best_bid() == (max(ob.bids) if ob.bids else None)
+        assert ob.best_ask() == (min(ob.asks) if ob.asks else None)
+
+
+def test_float_levels_match_sorted_levels():
+    ob = OrderBook(symbol="SOLUSDT")
+    ob.apply_snapshot(bids=[["99.5", "1"], ["100", "2"]], asks=[["101", "3"], ["100.5", "0.5"]], ts_ms=1, cts_ms=1)
+    bids, asks = ob.sorted_levels()
+    bids_p, bids_s, asks_p, asks_s = ob.float_levels()
+    assert list(zip(bids_p, bids_s)) == [(float(p), float(q)) for p, q in bids]
+    assert list(zip(asks_p, asks_s)) == [(float(p), float(q)) for p, q in asks]
+
+
+def test_price_parse_is_shared_and_tolerates_junk():
+    ob = OrderBook(symbol="SOLUSDT")
+    ob.apply_snapshot(bids=[["99.5", "1"], [["bad"], "1"], ["x", "1"]], asks=[["101", "1"]], ts_ms=1, cts_ms=1)
+    ob.apply_delta(bids=[["99.5", "2"]], asks=[], ts_ms=2, cts_ms=2)
+    assert list(ob.bids) == [Decimal("99.5")]
+    assert ob.bids[Decimal("99.5")] == Decimal("2")
+    assert _parse_price("99.5") is _parse_price("99.5")
+
+
+def test_delta_with_malformed_row_still_applies_good_rows():
+    ob = OrderBook(symbol="SOLUSDT")
+    ob.apply_snapshot(bids=[["99", "1"], ["98", "1"]], asks=[["101", "1"]], ts_ms=1, cts_ms=1)
+    ob.apply_delta(bids=[["99", "0"], ["x", "1"], ["97", "3"], ["96"]], asks=[["101", "2"]], ts_ms=2, cts_ms=2)
+    assert ob.bids_sorted() == [(Decimal("98"), Decimal("1")), (Decimal("97"), Decimal("3"))]
+    assert ob.asks_sorted() == [(Decimal("101"), Decimal("2"))]
+    assert ob.version == 2
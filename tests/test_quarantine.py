@@ -1,11 +1,14 @@
-"""Tests for core.quarantine."""
+"""Tests for core.quarantine and core.quarantine_manager."""
 
 from __future__ import annotations
 
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
+import core.quarantine_manager as qm_mod
 from core.quarantine import QuarantineEntry, load_quarantine, prune_expired, save_quarantine
+from core.quarantine_manager import QuarantineManager
 
 
 def test_prune_expired_removes_expired():
@@ -56,3 +59,85 @@ def test_load_save_quarantine_roundtrip():
         assert loaded["ETHUSDT"].reason == "other"
     finally:
         Path(path).unlink(missing_ok=True)
+
+
+def test_manager_keeps_denylist_sorted_incrementally():
+    cfg = SimpleNamespace(
+        filters=SimpleNamespace(denylist_symbols=["ZZZ", "AAA"]),
+        bybit=SimpleNamespace(symbols=[]),
+        trading=SimpleNamespace(tokens={}),
+    )
+    m = QuarantineManager("/nonexistent/q.yaml", cfg, [], {}, ["ZZZ", "AAA"], {})  # type: ignore[arg-type]
+    deny = cfg.filters.denylist_symbols
+
+    m._apply_quarantine_to_cfg()
+    assert deny == ["AAA", "ZZZ"]
+    m.quarantined_set |= {"MMM", "BBB"}
+    m._apply_quarantine_to_cfg()
+    m.quarantined_set.discard("MMM")
+    m._apply_quarantine_to_cfg()
+    assert cfg.filters.denylist_symbols is deny
+    assert deny == ["AAA", "BBB", "ZZZ"]
+    assert m.denylist_set == {"AAA", "BBB", "ZZZ"}
+
+
+def test_manager_reparses_quarantine_file_only_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "q.yaml"
+    save_quarantine(str(path), {"AAAUSDT": QuarantineEntry(reason="x", until_ts=2_000_000_000)})
+    parses = []
+    monkeypatch.setattr(qm_mod, "load_quarantine", lambda p: parses.append(p) or load_quarantine(p))
+    m = QuarantineManager(path, SimpleNamespace(), [], {}, [], {})  # type: ignore[arg-type]
+
+    q = m._load()
+    q["BBBUSDT"] = QuarantineEntry(reason="y", until_ts=2_000_000_000)
+    assert list(m._load()) == ["AAAUSDT"]
+    assert len(parses) == 1
+
+    m._save(q)
+    assert set(m._load()) == {"AAAUSDT", "BBBUSDT"}
+    assert len(parses) == 1
+
+    save_quarantine(str(path), {})
+    assert m._load() == {}
+    assert len(parses) == 2
+
+
+def test_manager_quarantine_delta_matches_full_rebuild():
+    def make() -> tuple[QuarantineManager, SimpleNamespace]:
+        tokens = {k: SimpleNamespace(bybit_symbol=f"{k}USDT", mint=f"m{k}", decimals=6) for k in ("AAA", "BBB", "CCC")}
+        cfg = SimpleNamespace(
+            filters=SimpleNamespace(denylist_symbols=["ZZZ"]),
+            bybit=SimpleNamespace(symbols=[]),
+            trading=SimpleNamespace(tokens={}),
+        )
+        symbols = [t.bybit_symbol for t in tokens.values()]
+        m = QuarantineManager("/nonexistent/q.yaml", cfg, symbols, tokens, ["ZZZ"], {})  # type: ignore[arg-type]
+        m._apply_quarantine_to_cfg()
+        m._rebuild_token_cfgs_inplace()
+        return m, cfg
+
+    delta, delta_cfg = make()
+    full, full_cfg = make()
+    for m in (delta, full):
+        m.quarantined_set.add("BBBUSDT")
+    delta._quarantine_inplace(["BBBUSDT"])
+    full._apply_quarantine_to_cfg()
+    full._rebuild_token_cfgs_inplace()
+
+    assert delta_cfg.bybit.symbols == full_cfg.bybit.symbols == ["AAAUSDT", "CCCUSDT"]
+    assert delta_cfg.trading.tokens == full_cfg.trading.tokens
+    assert delta.token_cfgs == full.token_cfgs and "BBB" not in delta.token_cfgs
+    assert delta_cfg.filters.denylist_symbols == full_cfg.filters.denylist_symbols == ["BBBUSDT", "ZZZ"]
+
+
+async def test_manager_async_load_save_share_the_parse_cache(tmp_path, monkeypatch):
+    path = tmp_path / "q.yaml"
+    parses = []
+    monkeypatch.setattr(qm_mod, "load_quarantine", lambda p: parses.append(p) or load_quarantine(p))
+    m = QuarantineManager(path, SimpleNamespace(), [], {}, [], {})  # type: ignore[arg-type]
+
+    assert await m._aload() == {}
+    await m._asave({"AAAUSDT": QuarantineEntry(reason="x", until_ts=2_000_000_000)})
+    assert list(await m._aload()) == ["AAAUSDT"]
+    assert list(m._load()) == ["AAAUSDT"]
+    assert parses == []
@@ -0,0 +1,47 @@
+"""Tests for core.quarantine_verifier."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+from connectors.jupiter import JupQuote
+from core.quarantine import QuarantineEntry, save_quarantine
+from core.quarantine_verifier import MAX_JUP_CHECKS_PER_RUN, verify_and_recover
+
+
+async def test_verify_batches_jupiter_checks_and_recovers_quoted_symbols(tmp_path):
+    path = tmp_path / "q.yaml"
+    until = 2_000_000_000
+    q = {f"T{i}USDT": QuarantineEntry(reason="JUP_NO_ROUTE", until_ts=until) for i in range(20)}
+    q["BADUSDT"] = QuarantineEntry(reason="BAD_TOKEN_CFG", until_ts=until)
+    save_quarantine(str(path), q)
+
+    removed: list[str] = []
+
+    async def remove_recovered(symbols, on_symbols_changed=None):
+        removed.extend(symbols)
+
+    q_manager = SimpleNamespace(
+        quarantine_path=path,
+        _file_lock=asyncio.Lock(),
+        symbol_to_info={sym: (f"mint{sym}", 6) for sym in q},
+        remove_recovered=remove_recovered,
+    )
+    batches: list[int] = []
+
+    class FakeJup:
+        async def quote_exact_in_batch(self, reqs, concurrency=8, on_result=None):
+            batches.append(len(reqs))
+            # only even tokens route again
+            return [
+                JupQuote(i, o, a, 1, Decimal("0"), 0, 0) if int(o[len("mintT") : -len("USDT")]) % 2 == 0 else None
+                for i, o, a in reqs
+            ]
+
+    n = await verify_and_recover(q_manager, FakeJup(), "usdc", 6, Decimal("100"))  # type: ignore[arg-type]
+
+    assert batches == [MAX_JUP_CHECKS_PER_RUN]
+    assert n == len(removed) == 8
+    assert all(int(sym[1:-4]) % 2 == 0 for sym in removed)
@@ -0,0 +1,20 @@
+"""Tests for core.runtime_settings."""
+
+from __future__ import annotations
+
+import asyncio
+
+from core.runtime_settings import RuntimeSettings, load_runtime_settings, save_runtime_settings_async
+
+
+async def test_concurrent_async_saves_leave_valid_latest_file(tmp_path):
+    path = str(tmp_path / "settings.json")
+    saves = []
+    for n in range(1, 21):
+        s = RuntimeSettings()
+        s.update("min_profit_usd", n)
+        saves.append(save_runtime_settings_async(path, s))
+    await asyncio.gather(*saves)
+
+    assert load_runtime_settings(path).min_profit_usd == 20.0
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
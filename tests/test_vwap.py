@@ -0,0 +1,43 @@
+"""Tests for core.vwap."""
+
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+
+from core.orderbook import OrderBook
+from core.vwap import simulate_buy_soa, simulate_buy_with_notional, simulate_sell_base, simulate_sell_soa
+
+
+def _book() -> OrderBook:
+    ob = OrderBook(symbol="SOLUSDT")
+    ob.apply_snapshot(
+        bids=[["99.5", "1"], ["100", "2"], ["98", "3"]],
+        asks=[["101", "1"], ["100.5", "4"], ["103", "2"]],
+        ts_ms=1,
+        cts_ms=1,
+    )
+    return ob
+
+
+def _close(a, b) -> bool:
+    return math.isclose(float(a), float(b), rel_tol=1e-12, abs_tol=1e-12)
+
+
+def test_soa_simulators_match_decimal_versions():
+    ob = _book()
+    bids, asks = ob.sorted_levels()
+    bids_p, bids_s, asks_p, asks_s = ob.float_levels()
+    for notional in ("50", "450", "1000"):
+        d = simulate_buy_with_notional(asks, Decimal(notional))
+        f = simulate_buy_soa(asks_p, asks_s, float(notional))
+        assert all(_close(getattr(d, k), getattr(f, k)) for k in ("base_out", "quote_out", "avg_price", "slippage_bps"))
+    for base in ("0.5", "2.5", "10"):
+        d = simulate_sell_base(bids, Decimal(base))
+        f = simulate_sell_soa(bids_p, bids_s, float(base))
+        assert all(_close(getattr(d, k), getattr(f, k)) for k in ("base_out", "quote_out", "avg_price", "slippage_bps"))
+
+
+def test_soa_simulators_empty_side():
+    assert simulate_buy_soa([], [], 100.0) is None
+    assert simulate_sell_soa([], [], 1.0) is None